@@ -0,0 +1,174 @@
+import argparse
+import random
+import re
+import time
+
+from src.services.answer_key_parser import AnswerKeyParser
+
+CARGOS = [
+    "AGENTE DE POLÍCIA",
+    "Soldado Policial Militar",
+    "Analista Judiciário",
+    "ESCRITURÁRIO",
+    "Técnico de Enfermagem",
+    "Oficial de Justiça",
+    "AUDITOR FISCAL",
+    "Professor de Matemática",
+]
+
+
+def _answers(rng: random.Random, questions: int, style: str) -> str:
+    letters = [rng.choice("ABCDE") if rng.random() > 0.02 else "X" for _ in range(questions)]
+    if style == "table":
+        rows = []
+        for start in range(0, questions, 10):
+            nums = range(start + 1, min(start + 11, questions + 1))
+            rows.append(" ".join(str(n) for n in nums))
+            rows.append(" ".join(letters[n - 1] for n in nums))
+        return "\n".join(rows)
+    separator = {"dash": " - ", "dot": ". ", "space": " "}[style]
+    return "\n".join(f"{i}{separator}{letter}" for i, letter in enumerate(letters, 1))
+
+
+def synthetic_gabarito(blocks: int, questions: int = 60, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = ["GABARITO DEFINITIVO", "www.pciconcursos.com.br"]
+    for i in range(blocks):
+        cargo = rng.choice(CARGOS)
+        style = rng.choice(["dash", "dot", "space", "table"])
+        parts.append(f"M{i + 1} - {cargo}")
+        parts.append(_answers(rng, questions, style))
+        parts.append(f"pcimarkpci {rng.getrandbits(64):x}")
+        if i % 3 == 2:
+            parts.append(f"Página {i // 3 + 1} de {blocks // 3 + 1}")
+    return "\n".join(parts)
+
+
+PARITY_CASES = [
+    "A\nB\nC",
+    "ABCpcimarkpci x\nD",
+    "A\nPágina 1 de 2\nB",
+    "M1 - AGENTE DE POLICIA PROVA1 A 2 B 3 C 4 D 5 E 6 A",
+    "M1 - ESCRIVÃO\n1 - A\n2 - B\n3 - C\n4 - D\n5 - E\n"
+    "M2 - PERITO\n1 A\n2 B\n3 C\n4 D\n5 E\n6 X",
+    "GABARITO\nANALISTA\nJUDICIÁRIO\n1. A\n2. B\n3. C\n4. D\n5. E",
+]
+
+
+def reference_clean(text: str) -> str:
+    text = re.sub(r"pcimarkpci\s*\S+", "", text)
+    text = re.sub(r"www\.pciconcursos\.com\.br", "", text)
+    text = re.sub(r"Página\s*\d+\s*de\s*\d+", "", text)
+    return re.sub(r"([A-ZÀ-Ÿ])\n([A-ZÀ-Ÿ])", r"\1\2", text)
+
+
+def reference_parse(text: str) -> list[tuple[str, str, dict[int, str]]]:
+    """Sequential-substitution parser kept as the output reference."""
+    text = reference_clean(text)
+    answer_keys = []
+    cargo_patterns = [
+        (r"M(\d+)\s*[-–]\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)(?:\n|PROVA)", "m_pattern"),
+        (r"([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+(?:Militar|Bombeiro|Polícia|Civil|Perito|Tenente|Soldado|Oficial|Agente|Contador|Analista|Técnico|Escriturário|Assistente|Auxiliar|Administrador|Engenheiro|Advogado|Médico|Enfermeiro|Professor|Fiscal|Auditor|Delegado|Escrivão|Inspetor|Motorista|Operador|Secretário|Gestor|Coordenador|Supervisor|Gerente|Diretor)[A-Za-zÀ-ÿº\s\-–]*)[–\-]\s*Tipo\s*(\d+)", "tipo"),
+        (r"(?:GABARITO\s*(?:OFICIAL|DEFINITIVO|PRELIMINAR)?)\s*\n?\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)\s+Prova\s*[-–]?\s*([A-Z0-9]+)", "prova"),
+        (r"\n\s*([A-ZÀ-Ÿ][A-ZÀ-Ÿ\s\-–]+(?:ÁRIO|ISTA|OR|ENTE|IVO|ICO|IRO|ADO|IDO|OSO|ÃO|EIRO|ADOR)[A-ZÀ-Ÿ\s\-–]*)\s*\n\s*(?=\d+\s*[-–:]?\s*[A-E])", "uppercase"),
+    ]
+
+    for pattern, pattern_type in cargo_patterns:
+        blocks = list(re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
+        for i, match in enumerate(blocks):
+            if pattern_type == "m_pattern":
+                tipo = match.group(1).strip()
+                exam_name = match.group(2).strip()
+            else:
+                exam_name = match.group(1).strip()
+                tipo = match.group(2).strip() if match.lastindex >= 2 else "1"
+
+            exam_name = re.sub(r"^(GABARITO\s*(DEFINITIVO|PRELIMINAR|OFICIAL)?\s*)",
+                               "", exam_name, flags=re.IGNORECASE).strip()
+            exam_name = re.sub(r"^\d*º?\s*", "", exam_name).strip()
+            exam_name = re.sub(r"\s+", " ", exam_name).strip()
+            if len(exam_name) < 4 or exam_name.upper() in ("PROVA", "GABARITO", "TIPO"):
+                continue
+
+            end = blocks[i + 1].start() if i + 1 < len(blocks) else len(text)
+            answers = _reference_answers(text[match.end():end])
+            if len(answers) >= 5 and not any(
+                    name == exam_name and t == tipo for name, t, _ in answer_keys):
+                answer_keys.append((exam_name, tipo, answers))
+
+        if answer_keys:
+            return answer_keys
+
+    answers = _reference_answers(text)
+    if len(answers) >= 5:
+        return [(AnswerKeyParser().extract_exam_name(text), "1", answers)]
+    return []
+
+
+def _reference_answers(block_text: str) -> dict[int, str]:
+    answers = {}
+    table_pattern = r"(\d+(?:\s+\d+){4,})\s*\n\s*([A-EX](?:\s+[A-EX]){4,})"
+    for match in re.finditer(table_pattern, block_text, re.IGNORECASE):
+        nums = [int(n) for n in match.group(1).split()]
+        letters = match.group(2).upper().split()
+        for num, letter in zip(nums, letters):
+            if 1 <= num <= 200 and letter in "ABCDEX":
+                answers[num] = letter
+    if answers:
+        return answers
+
+    patterns = [
+        r"(\d{1,3})\s*[-–:]\s*([A-EX])",
+        r"(\d{1,3})\s*[\.]\s*([A-EX])",
+        r"\b(\d{1,3})\s+([A-EX])\b",
+    ]
+    for pattern in patterns:
+        for num_str, letter in re.findall(pattern, block_text, re.IGNORECASE):
+            num = int(num_str)
+            if 1 <= num <= 200 and num not in answers:
+                answers[num] = letter.upper()
+    return answers
+
+
+def check_parity(sizes: list[int]) -> int:
+    parser = AnswerKeyParser()
+    texts = list(PARITY_CASES) + [synthetic_gabarito(blocks) for blocks in sizes]
+    failures = 0
+    for text in texts:
+        expected = reference_parse(text)
+        actual = [(key.exam_name, key.tipo, key.answers) for key in parser.parse(text)]
+        if actual != expected or parser.clean(text) != reference_clean(text):
+            failures += 1
+            print(f"parity mismatch: {text[:60]!r}")
+    print(f"parity: {len(texts) - failures}/{len(texts)} texts match")
+    return failures
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    parser = AnswerKeyParser()
+    print(f"{'blocks':>8} {'chars':>10} {'keys':>6} {'best ms':>10} {'MB/s':>8}")
+    for blocks in sizes:
+        text = synthetic_gabarito(blocks)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            keys = parser.parse(text)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        print(f"{blocks:>8} {len(text):>10} {len(keys):>6} {best * 1000:>10.2f} "
+              f"{len(text) / best / 1e6:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer-key parser throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-parity", action="store_true")
+    args = parser.parse_args()
+    if not args.skip_parity and check_parity(args.sizes):
+        raise SystemExit(1)
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
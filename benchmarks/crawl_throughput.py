@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from aiohttp import web
+
+from benchmarks.answer_key_parser import synthetic_gabarito
+from src.config import ExamSource
+from src.pipeline import ExamPipeline
+from src.scrapers import PciConcursosScraper
+from src.services import HostRateLimiter, HttpCache, HttpClient, PdfExtractor, PdfStore, StateStore
+from src.services.extraction_cache import ExtractionCache
+from src.services.pdf_extractor import EXTRACTOR_VERSIONS
+
+LEVELS = ["Superior", "Médio", "Fundamental"]
+BANCAS = ["FGV", "CEBRASPE", "FCC", "VUNESP", "IBFC"]
+
+
+@dataclass
+class SiteConfig:
+    sources: int = 4
+    pages: int = 5
+    exams_per_page: int = 20
+    unique_pdfs: int = 40
+    pdf_pages: int = 2
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    throttle_rate: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        ops = ["BT /F1 10 Tf 12 TL 40 800 Td"]
+        for line in text.split("\n"):
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode()
+    return bytes(out)
+
+
+def _listing(config: SiteConfig, base: str, banca: str, page: int) -> str:
+    rng = random.Random(f"{config.seed}:{banca}:{page}")
+    rows = []
+    if page <= config.pages:
+        for i in range(config.exams_per_page):
+            exam_id = f"{banca}-{page}-{i}"
+            rows.append(
+                f"<tr class='lk_link' data-url='{base}/prova/{exam_id}'>"
+                f"<td><a class='prova_download'>Prova {exam_id}</a></td>"
+                f"<td>{rng.randint(2005, 2025)}</td><td>Prefeitura {rng.randint(1, 500)}</td>"
+                f"<td>{rng.choice(BANCAS)}</td><td>{rng.choice(LEVELS)}</td></tr>")
+    return f"<html><body><table>{''.join(rows)}</table></body></html>"
+
+
+def _download_page(base: str, exam_id: str) -> str:
+    return (f"<html><body><a href='{base}/arquivos/{exam_id}/prova.pdf'>Prova</a>"
+            f"<a href='{base}/arquivos/{exam_id}/gabarito.pdf'>Gabarito</a></body></html>")
+
+
+def make_app(config: SiteConfig, base: str) -> web.Application:
+    rng = random.Random(config.seed)
+    pdfs = [
+        make_pdf([synthetic_gabarito(3, seed=config.seed * 100003 + i * config.pdf_pages + p)
+                  for p in range(config.pdf_pages)])
+        for i in range(config.unique_pdfs)
+    ]
+
+    @web.middleware
+    async def inject(request: web.Request, handler):
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+        roll = rng.random()
+        if roll < config.throttle_rate:
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if roll < config.throttle_rate + config.failure_rate:
+            return web.Response(status=500)
+        return await handler(request)
+
+    async def listing(request: web.Request) -> web.Response:
+        page = int(request.match_info.get("page", 1))
+        return web.Response(
+            text=_listing(config, base, request.match_info["banca"], page), content_type="text/html")
+
+    async def download_page(request: web.Request) -> web.Response:
+        return web.Response(
+            text=_download_page(base, request.match_info["exam_id"]), content_type="text/html")
+
+    async def pdf(request: web.Request) -> web.Response:
+        index = zlib.crc32(request.match_info["exam_id"].encode()) % len(pdfs)
+        return web.Response(body=pdfs[index], content_type="application/pdf")
+
+    app = web.Application(middlewares=[inject])
+    app.router.add_get("/provas/{banca}", listing)
+    app.router.add_get("/provas/{banca}/{page}", listing)
+    app.router.add_get("/prova/{exam_id}", download_page)
+    app.router.add_get("/arquivos/{exam_id}/{name}", pdf)
+    return app
+
+
+def _serve(config: SiteConfig, port: int, ready) -> None:
+    async def main() -> None:
+        runner = web.AppRunner(make_app(config, f"http://127.0.0.1:{port}"), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TimedHttpClient(HttpClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: list[float] = []
+
+    @asynccontextmanager
+    async def get(self, url, headers=None, throttle=True):
+        if throttle:
+            await self.throttle(url)
+        started = time.perf_counter()
+        async with super().get(url, headers=headers, throttle=False) as response:
+            self.latencies.append(time.perf_counter() - started)
+            yield response
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def _git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+async def crawl(config: SiteConfig, port: int, executor: str, workers: int, rate: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    sources = [ExamSource(f"banca{i}", f"{base}/provas/banca{i}") for i in range(config.sources)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        client = TimedHttpClient(limiter=HostRateLimiter(rate=rate))
+        scraper = PciConcursosScraper(
+            client=client, cache=HttpCache(tmp / "http_cache"), state=StateStore(tmp / "state.sqlite3"),
+            incremental=False)
+        extractor = PdfExtractor(
+            executor=executor, max_workers=workers, client=client, cache=scraper.cache,
+            store=PdfStore(tmp / "pdfs"), concurrency=scraper.concurrency,
+            results_cache=ExtractionCache(EXTRACTOR_VERSIONS, tmp / "extraction_cache"))
+
+        exams = pdfs = errors = 0
+        started = time.perf_counter()
+        try:
+            async for result in ExamPipeline(scraper, extractor).run(sources):
+                exams += 1
+                if result.error:
+                    errors += 1
+                elif result.answer_keys:
+                    pdfs += 1
+        finally:
+            elapsed = time.perf_counter() - started
+            extractor.close()
+            await client.close()
+            scraper.state.close()
+
+    latencies = [latency * 1000 for latency in client.latencies]
+    return {
+        "exams": exams,
+        "pdfs": pdfs,
+        "errors": errors,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "exams_per_sec": round(exams / elapsed, 2),
+        "pdfs_per_sec": round(pdfs / elapsed, 2),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+    }
+
+
+def run(config: SiteConfig, executor: str, workers: int, rate: float) -> dict:
+    port = _free_port()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(config, port, ready), daemon=True)
+    server.start()
+    try:
+        if not ready.wait(60):
+            raise RuntimeError("Benchmark server did not start")
+        stats = asyncio.run(crawl(config, port, executor, workers, rate))
+        worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    finally:
+        server.terminate()
+        server.join()
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "executor": executor,
+        "workers": workers,
+        "config": asdict(config),
+        **stats,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(worker_rss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end crawl throughput")
+    defaults = SiteConfig()
+    parser.add_argument("--sources", type=int, default=defaults.sources)
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--exams-per-page", type=int, default=defaults.exams_per_page)
+    parser.add_argument("--unique-pdfs", type=int, default=defaults.unique_pdfs)
+    parser.add_argument("--pdf-pages", type=int, default=defaults.pdf_pages)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate)
+    parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Client requests per second per host (0 disables the limiter)")
+    parser.add_argument("--output", type=Path, help="Append the JSON result to this file")
+    args = parser.parse_args()
+
+    config = SiteConfig(
+        sources=args.sources,
+        pages=args.pages,
+        exams_per_page=args.exams_per_page,
+        unique_pdfs=args.unique_pdfs,
+        pdf_pages=args.pdf_pages,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    result = run(config, args.executor, args.workers, args.rate)
+
+    print(f"commit {result['commit']}  {result['exams']} exams, {result['pdfs']} PDFs, "
+          f"{result['errors']} errors, {result['requests']} requests in {result['seconds']} s")
+    print(f"{result['exams_per_sec']} exams/s  {result['pdfs_per_sec']} PDFs/s  "
+          f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+          f"peak RSS {result['peak_rss_mb']} MB (workers {result['peak_worker_rss_mb']} MB)")
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result, sort_keys=True) + "\n")
+    else:
+        json.dump(result, sys.stdout, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import random
+import time
+
+from src.scrapers import PciConcursosScraper
+from src.scrapers.html_backends import BACKENDS
+
+LEVELS = ["Superior", "Médio", "Fundamental", "Médio / Técnico"]
+
+
+def synthetic_listing(rows: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = [
+        "<html><head><title>Provas</title><script>var x = '<tr>';</script></head><body>",
+        "<div id='menu'><ul>" + "".join(f"<li><a href='/m/{i}'>Menu {i}</a></li>" for i in range(200)) + "</ul></div>",
+        "<table id='lista'><thead><tr><th>Prova</th><th>Ano</th><th>Órgão</th><th>Instituição</th><th>Nível</th></tr></thead><tbody>",
+    ]
+    for i in range(rows):
+        extra = " destaque" if i % 7 == 0 else ""
+        parts.append(
+            f"<tr class='lk_link{extra}' data-url='https://www.pciconcursos.com.br/prova/{i}'>"
+            f"<td><a class='prova_download' href='#'> Prova {i} <span>Cargo &amp; Área</span> </a></td>"
+            f"<td>{rng.randint(2005, 2025)}</td>"
+            f"<td><!-- órgão --> Prefeitura de Cidade {rng.randint(1, 500)} </td>"
+            f"<td>{rng.choice(['FGV', 'CEBRASPE', 'FCC', 'VUNESP'])}</td>"
+            f"<td>{rng.choice(LEVELS)}</td></tr>"
+        )
+        if i % 10 == 0:
+            parts.append("<tr class='ads'><td colspan='5'>Publicidade</td></tr>")
+    parts.append("</tbody></table><div id='rodape'>" + "<p>texto</p>" * 300 + "</div></body></html>")
+    return "".join(parts)
+
+
+def synthetic_download_page(seed: int = 0) -> str:
+    return (
+        "<html><body><div>"
+        + "".join(f"<a href='/outro/{i}'>link</a>" for i in range(300))
+        + f"<a href='https://arquivo.pciconcursos.com.br/provas/{seed}/prova.pdf'>Prova</a>"
+        + f"<a href='https://arquivo.pciconcursos.com.br/provas/{seed}/gabarito.pdf'>Gabarito</a>"
+        + "<a href='https://example.com/edital.PDF'>Edital</a>"
+        + "</div></body></html>"
+    )
+
+
+def run(rows: int, repeat: int) -> None:
+    listing = synthetic_listing(rows)
+    download_page = synthetic_download_page()
+    reference = PciConcursosScraper(html_backend="bs4")
+    expected_exams = reference.parse_exam_list(listing)
+    expected_links = reference.parse_download_page(download_page)
+
+    print(f"{'backend':>10} {'rows':>6} {'listing ms':>11} {'download ms':>12} {'parity':>7}")
+    for name in BACKENDS:
+        try:
+            scraper = PciConcursosScraper(html_backend=name)
+        except ImportError as e:
+            print(f"{name:>10} skipped: {e}")
+            continue
+
+        listing_times = []
+        download_times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            exams = scraper.parse_exam_list(listing)
+            listing_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            links = scraper.parse_download_page(download_page)
+            download_times.append(time.perf_counter() - started)
+
+        parity = exams == expected_exams and links == expected_links
+        print(f"{name:>10} {len(exams):>6} {min(listing_times) * 1000:>11.2f} "
+              f"{min(download_times) * 1000:>12.2f} {'ok' if parity else 'FAIL':>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML backend throughput and parity")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
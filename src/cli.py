@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Optional
+
+from src.config import EXAM_BANCAS, EXAM_CATEGORIES, EXAM_SOURCES, ExamSource, settings, setup_logging
+
+
+def parse_pages(value: str) -> list[int]:
+    pages = []
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        try:
+            first = int(start)
+            last = int(end) if end else first
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid page range: {part!r}") from None
+        if first < 1 or last < first:
+            raise argparse.ArgumentTypeError(f"Invalid page range: {part!r}")
+        pages.extend(range(first, last + 1))
+    return pages
+
+
+def select_sources(names: Optional[Sequence[str]], categories: bool) -> list[ExamSource]:
+    if not names:
+        return EXAM_CATEGORIES if categories else EXAM_SOURCES
+
+    known = {source.name.casefold(): source for source in (*EXAM_BANCAS, *EXAM_CATEGORIES)}
+    sources = []
+    for name in names:
+        source = known.get(name.casefold())
+        if source is None:
+            raise SystemExit(f"Unknown source: {name} (choose from {', '.join(sorted(known))})")
+        sources.append(source)
+    return sources
+
+
+async def crawl(args: argparse.Namespace, parse_answer_keys: bool = True) -> None:
+    from src.metrics import configured_sinks
+    from src.pipeline import ExamPipeline
+    from src.scrapers import PciConcursosScraper
+    from src.services import HostRateLimiter, HttpClient, PdfExtractor
+    from src.sinks import ResultWriter
+
+    sources = select_sources(args.source, args.categories)
+    client = HttpClient(limiter=HostRateLimiter(rate=args.requests_per_second))
+    scraper = PciConcursosScraper(
+        client=client, max_concurrent=args.max_concurrent, html_backend=args.html_backend)
+    extractor = PdfExtractor(
+        client=client, max_workers=args.pdf_workers, concurrency=scraper.concurrency)
+
+    try:
+        async with AsyncExitStack() as stack:
+            for sink in configured_sinks():
+                await stack.enter_async_context(sink)
+            writer = await stack.enter_async_context(ResultWriter(
+                args.output_dir, args.format,
+                on_flush=lambda results: scraper.state.record_processed(
+                    (result.exam, result.source) for result in results if not result.error)))
+
+            if not parse_answer_keys or args.queue == "none":
+                results = ExamPipeline(
+                    scraper,
+                    extractor,
+                    listing_concurrency=args.listing_concurrency,
+                    enrich_concurrency=args.enrich_concurrency,
+                    fetch_concurrency=args.fetch_concurrency,
+                    parse_concurrency=args.parse_concurrency,
+                    parse_answer_keys=parse_answer_keys,
+                ).run(sources)
+            else:
+                from src.jobs import CrawlWorker, get_job_queue
+
+                queue = await stack.enter_async_context(get_job_queue(args.queue))
+                worker = CrawlWorker(queue, scraper, extractor, concurrency=args.worker_concurrency)
+                if await queue.is_idle():
+                    print(f"Seeded {await worker.seed(sources)} listing jobs")
+                results = worker.run(flush=writer.flush_async)
+
+            async for result in results:
+                await writer.write_result_async(result)
+                exam = result.exam
+
+                if result.error:
+                    print(f"Failed to process {exam.name}: {result.error}")
+                elif result.answer_keys:
+                    print(f"📝 [{result.source}] {exam.name} ({exam.year}): "
+                          f"{len(result.answer_keys)} answer key(s)")
+                elif not parse_answer_keys:
+                    print(f"🔗 [{result.source}] {exam.name} ({exam.year}): "
+                          f"{exam.download.answer_key_url or 'no answer key'}")
+
+            await writer.flush_async()
+            print(f"Wrote {writer.exams.rows_written} exams and "
+                  f"{writer.answer_keys.rows_written} answer keys "
+                  f"to {args.output_dir or settings.output_dir}")
+    finally:
+        extractor.close()
+        await client.close()
+
+
+async def _download(url: str):
+    from src.services.pdf_extractor import PdfExtractor
+
+    extractor = PdfExtractor()
+    try:
+        return await extractor.download_pdf(url)
+    finally:
+        await extractor.client.close()
+
+
+def extract_pdf(args: argparse.Namespace) -> None:
+    from src.services.pdf_extractor import PdfExtractor
+
+    extractor = PdfExtractor(executor="thread")
+    source = args.pdf
+    if source.startswith(("http://", "https://")):
+        source = asyncio.run(_download(source))
+    elif not Path(source).is_file():
+        raise SystemExit(f"No such file: {source}")
+    else:
+        source = Path(source)
+
+    if args.what == "text":
+        content = extractor.extract_text(source, pages=args.pages)
+        if args.json:
+            print(json.dumps({
+                "num_pages": content.num_pages,
+                "metadata": content.metadata,
+                "text": content.text,
+            }, ensure_ascii=False))
+        else:
+            print(content.text)
+    elif args.what == "answer-keys":
+        for answer_key in extractor.extract_answer_keys_from_pdf(source, args.pages):
+            if args.json:
+                print(json.dumps(answer_key.to_row(), ensure_ascii=False))
+            else:
+                print(f"{answer_key.tipo}: {answer_key.answer_string()}")
+    else:
+        if args.pages is None:
+            questions = extractor.extract_questions_from_pdf(source)
+        else:
+            questions = extractor.extract_questions(extractor.extract_text(source, pages=args.pages).text)
+        for question in questions:
+            if args.json:
+                print(json.dumps(question, ensure_ascii=False))
+            else:
+                print(f"Questão {question['number']}: {question['text'][:100]}...")
+
+
+async def stats(args: argparse.Namespace) -> None:
+    from src.services.state_store import StateStore
+
+    state = StateStore(args.state_db)
+    try:
+        rows = state.stats()
+    finally:
+        state.close()
+
+    print(f"{'source':<24} {'exams':>8} {'enriched':>9} {'answer keys':>12}")
+    totals = [0, 0, 0]
+    for source, exams, enriched, answer_keys in rows:
+        print(f"{source or '-':<24} {exams:>8} {enriched:>9} {answer_keys:>12}")
+        totals = [totals[0] + exams, totals[1] + enriched, totals[2] + answer_keys]
+    print(f"{'total':<24} {totals[0]:>8} {totals[1]:>9} {totals[2]:>12}")
+
+    if args.queue != "none":
+        from src.jobs import get_job_queue
+
+        async with get_job_queue(args.queue) as queue:
+            counts = await queue.counts()
+        print("jobs: " + ", ".join(f"{status}={count}" for status, count in counts.items()))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scraper", description="Scraper de provas de concursos")
+    parser.add_argument("--log-level", default=settings.log_level)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_crawl_options(command: argparse.ArgumentParser) -> None:
+        command.add_argument(
+            "-s", "--source", action="append",
+            help="Banca or category to crawl (repeatable, defaults to every banca)")
+        command.add_argument(
+            "--categories", action="store_true", help="Crawl every category instead of every banca")
+        command.add_argument("--output-dir", default=settings.output_dir)
+        command.add_argument("--format", choices=("jsonl", "parquet"), default=settings.output_format)
+        command.add_argument("--html-backend", default=settings.html_backend)
+        command.add_argument("--max-concurrent", type=int, default=settings.max_concurrent_requests)
+        command.add_argument("--requests-per-second", type=float, default=settings.requests_per_second)
+        command.add_argument("--listing-concurrency", type=int, default=settings.listing_concurrency)
+        command.add_argument("--enrich-concurrency", type=int, default=settings.enrich_concurrency)
+        command.add_argument("--fetch-concurrency", type=int, default=settings.fetch_concurrency)
+        command.add_argument("--parse-concurrency", type=int, default=settings.parse_concurrency)
+        command.add_argument("--pdf-workers", type=int, default=settings.pdf_workers)
+
+    crawl_command = commands.add_parser("crawl", help="List, enrich and parse answer keys")
+    add_crawl_options(crawl_command)
+    crawl_command.add_argument(
+        "--queue", choices=("none", "sqlite", "redis"), default=settings.job_queue)
+    crawl_command.add_argument(
+        "--worker-concurrency", type=int, default=settings.job_worker_concurrency)
+
+    enrich_command = commands.add_parser(
+        "enrich", help="List and enrich exams without downloading answer keys")
+    add_crawl_options(enrich_command)
+
+    extract_command = commands.add_parser("extract-pdf", help="Extract a local or remote PDF")
+    extract_command.add_argument("pdf", help="Path or URL of the PDF")
+    extract_command.add_argument(
+        "--what", choices=("text", "answer-keys", "questions"), default="answer-keys")
+    extract_command.add_argument(
+        "--pages", type=parse_pages, help="Pages to extract, e.g. 1-3,5")
+    extract_command.add_argument("--json", action="store_true", help="Print JSON lines")
+
+    stats_command = commands.add_parser("stats", help="Summarize crawl state and job queue")
+    stats_command.add_argument("--state-db", default=settings.state_db_path)
+    stats_command.add_argument(
+        "--queue", choices=("none", "sqlite", "redis"), default=settings.job_queue)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    setup_logging(args.log_level)
+
+    if args.command == "crawl":
+        asyncio.run(crawl(args))
+    elif args.command == "enrich":
+        asyncio.run(crawl(args, parse_answer_keys=False))
+    elif args.command == "extract-pdf":
+        extract_pdf(args)
+    elif args.command == "stats":
+        asyncio.run(stats(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
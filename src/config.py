@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -27,9 +28,127 @@ class Settings(BaseSettings):
     max_concurrent_requests: int = Field(
         default=10, description="Maximum concurrent HTTP requests"
     )
+    adaptive_concurrency: bool = Field(
+        default=True, description="Adjust concurrency to latency and throttling responses")
+    min_concurrent_requests: int = Field(
+        default=1, description="Lower bound for adaptive concurrency")
+    adaptive_max_concurrent: int = Field(
+        default=32, description="Upper bound for adaptive concurrency")
+    adaptive_latency_factor: float = Field(
+        default=3.0, description="Latency over baseline times this factor counts as congestion")
+    connection_limit: int = Field(
+        default=100, description="Maximum open connections in the shared HTTP client")
+    connection_limit_per_host: int = Field(
+        default=32, description="Maximum open connections per host")
+    dns_cache_ttl: int = Field(
+        default=300, description="Seconds DNS lookups are cached by the HTTP client")
+    keepalive_timeout: float = Field(
+        default=30.0, description="Seconds idle connections are kept alive")
+    requests_per_second: float = Field(
+        default=5.0, description="Sustained request rate allowed per host")
+    request_burst: int = Field(
+        default=10, description="Requests a host may receive in a burst above the rate")
     retry_attempts: int = Field(
         default=3, description="Number of retry attempts")
     log_level: str = Field(default="INFO", description="Logging level")
+    output_dir: str = Field(
+        default="output", description="Directory for crawl output files")
+    output_format: str = Field(
+        default="jsonl", description="Output format (jsonl or parquet)")
+    output_batch_rows: int = Field(
+        default=10000, description="Rows buffered before an output part file is written")
+    output_flush_seconds: float = Field(
+        default=30.0, description="Seconds before a partial output batch is written")
+    pdf_executor: str = Field(
+        default="process", description="Executor for PDF parsing (process or thread)")
+    pdf_workers: Optional[int] = Field(
+        default=None, description="PDF parsing workers (defaults to CPU count)")
+    pdf_max_queued: int = Field(
+        default=32, description="Maximum PDF parsing jobs submitted at once")
+    pdf_pages_per_job: int = Field(
+        default=16, description="Pages per parallel text extraction job (0 disables splitting)")
+    pdf_image_mode: str = Field(
+        default="decode", description="Image extraction mode (decode, headers or disk)")
+    pdf_image_dir: Optional[str] = Field(
+        default=None, description="Directory for extracted images (defaults to download_dir/images)")
+    http_cache_enabled: bool = Field(
+        default=True, description="Cache HTTP responses on disk under download_dir")
+    http_cache_max_mb: int = Field(
+        default=2048, description="Maximum size of the HTTP cache in megabytes")
+    http_cache_ttl_listing: float = Field(
+        default=3600.0, description="Seconds a cached listing page is served without revalidation")
+    http_cache_ttl_page: float = Field(
+        default=30 * 24 * 3600.0, description="Seconds a cached download page is served without revalidation")
+    http_cache_ttl_pdf: float = Field(
+        default=365 * 24 * 3600.0, description="Seconds a cached PDF is served without revalidation")
+    extraction_cache_enabled: bool = Field(
+        default=True, description="Cache PDF extraction results by content hash and version")
+    extraction_cache_dir: Optional[str] = Field(
+        default=None, description="Extraction cache directory (defaults to download_dir/extraction_cache)")
+    extraction_cache_max_mb: int = Field(
+        default=512, description="Maximum size of the extraction cache in MB")
+    near_duplicates_enabled: bool = Field(
+        default=True, description="Reuse results of near-duplicate answer-key PDFs")
+    near_duplicates_path: Optional[str] = Field(
+        default=None, description="Near-duplicate signature database (defaults to download_dir/near_duplicates.sqlite3)")
+    near_duplicate_threshold: float = Field(
+        default=0.95, description="Estimated Jaccard similarity above which PDFs are near-duplicates")
+    minhash_permutations: int = Field(
+        default=128, description="MinHash signature length")
+    lsh_bands: int = Field(
+        default=32, description="LSH bands the MinHash signature is split into")
+    max_pdf_mb: int = Field(
+        default=100, description="Maximum size of a downloaded PDF in megabytes")
+    pdf_store_max_mb: int = Field(
+        default=8192, description="Maximum size of the PDF store in megabytes (least recently used PDFs are evicted)")
+    state_db_path: Optional[str] = Field(
+        default=None, description="SQLite crawl state file (defaults to download_dir/state.sqlite3)")
+    incremental: bool = Field(
+        default=False, description="Stop paginating at known exams and skip enriched ones")
+    html_backend: str = Field(
+        default="strainer", description="HTML parser backend (bs4, strainer or lxml)")
+    listing_window: int = Field(
+        default=4, description="Listing pages fetched ahead of the one being yielded")
+    listing_concurrency: int = Field(
+        default=4, description="Sources listed concurrently by the pipeline")
+    enrich_concurrency: int = Field(
+        default=10, description="Concurrent download-page enrichments in the pipeline")
+    fetch_concurrency: int = Field(
+        default=4, description="Concurrent PDF downloads in the pipeline")
+    parse_concurrency: int = Field(
+        default=4, description="Concurrent PDF parse jobs in the pipeline")
+    pipeline_queue_size: int = Field(
+        default=100, description="Capacity of each queue between pipeline stages")
+    search_index_dir: Optional[str] = Field(
+        default=None, description="Question search index directory (defaults to download_dir/search_index)")
+    search_max_segments: int = Field(
+        default=8, description="Index segments of similar size kept before they are merged into one")
+    job_queue: str = Field(
+        default="none", description="Durable crawl job queue backend (none, sqlite or redis)")
+    job_queue_path: Optional[str] = Field(
+        default=None, description="SQLite job queue file (defaults to download_dir/jobs.sqlite3)")
+    job_queue_url: str = Field(
+        default="redis://localhost:6379/0", description="Redis URL for the redis job queue")
+    job_shards: int = Field(
+        default=1, description="Number of shards crawl jobs are split into by source")
+    worker_shards: Optional[list[int]] = Field(
+        default=None, description="Shards this worker leases jobs from (all if unset)")
+    worker_id: Optional[str] = Field(
+        default=None, description="Worker ID used for job leases (defaults to host name and shards)")
+    job_lease_seconds: float = Field(
+        default=300.0, description="Seconds a leased job stays reserved without a heartbeat")
+    job_max_attempts: int = Field(
+        default=5, description="Attempts before a job is marked dead")
+    job_worker_concurrency: int = Field(
+        default=16, description="Jobs processed concurrently by one worker")
+    job_poll_interval: float = Field(
+        default=1.0, description="Seconds between polls when no job is ready")
+    metrics_port: Optional[int] = Field(
+        default=None, description="Port for the Prometheus metrics endpoint (disabled if unset)")
+    metrics_host: str = Field(
+        default="127.0.0.1", description="Interface the metrics endpoint binds to")
+    metrics_log_interval: float = Field(
+        default=60.0, description="Seconds between metrics log summaries (0 disables)")
 
     model_config = {"env_prefix": "SCRAPER_", "env_file": ".env", "extra": "ignore"}
 
@@ -105,5 +224,19 @@ EXAM_CATEGORIES: list[ExamSource] = [
 EXAM_SOURCES: list[ExamSource] = EXAM_BANCAS
 
 
-settings = Settings()
-logger = setup_logging(settings.log_level)
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def __getattr__(name: str):
+    if name == "settings":
+        return get_settings()
+    if name == "logger":
+        return setup_logging(get_settings().log_level)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
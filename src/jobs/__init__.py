@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING, Optional
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.jobs.base import Job, JobQueue, shard_for
+    from src.jobs.redis_queue import RedisJobQueue
+    from src.jobs.sqlite_queue import SqliteJobQueue
+    from src.jobs.worker import CrawlWorker
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.jobs.base": ("Job", "JobQueue", "shard_for"),
+    "src.jobs.redis_queue": ("RedisJobQueue",),
+    "src.jobs.sqlite_queue": ("SqliteJobQueue",),
+    "src.jobs.worker": ("CrawlWorker",),
+})
+
+JOB_QUEUES = {
+    "sqlite": "SqliteJobQueue",
+    "redis": "RedisJobQueue",
+}
+
+
+def get_job_queue(backend: Optional[str] = None, **kwargs) -> "JobQueue":
+    from src.config import settings
+
+    backend = backend or settings.job_queue
+    try:
+        queue_class = __getattr__(JOB_QUEUES[backend])
+    except KeyError:
+        raise ValueError(f"Unknown job queue backend: {backend}") from None
+    return queue_class(**kwargs)
+
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "SqliteJobQueue",
+    "RedisJobQueue",
+    "CrawlWorker",
+    "get_job_queue",
+    "shard_for",
+]
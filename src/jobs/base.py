@@ -0,0 +1,102 @@
+import socket
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.config import settings
+
+JOB_KINDS = ("listing", "enrich", "pdf")
+
+
+def shard_for(source: str, num_shards: int) -> int:
+    return zlib.crc32(source.encode("utf-8")) % num_shards
+
+
+def default_worker_id(shards: Iterable[int]) -> str:
+    return f"{socket.gethostname()}:shards-{'-'.join(str(shard) for shard in shards)}"
+
+
+@dataclass
+class Job:
+    kind: str
+    source: str
+    key: str
+    payload: dict = field(default_factory=dict)
+    shard: int = 0
+    id: Optional[str] = None
+    attempts: int = 0
+
+
+class JobQueue(ABC):
+    def __init__(
+        self,
+        num_shards: int = settings.job_shards,
+        shards: Optional[Iterable[int]] = settings.worker_shards,
+        lease_seconds: float = settings.job_lease_seconds,
+        max_attempts: int = settings.job_max_attempts,
+        worker_id: Optional[str] = settings.worker_id,
+    ):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.shards = sorted(set(shards)) if shards is not None else list(range(num_shards))
+        if any(not 0 <= shard < num_shards for shard in self.shards):
+            raise ValueError(f"Shards must be in range(0, {num_shards})")
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or default_worker_id(self.shards)
+
+    def job(self, kind: str, source: str, key: str, payload: Optional[dict] = None) -> Job:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        return Job(kind, source, key, payload or {}, shard_for(source, self.num_shards))
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(2.0 ** attempts, 300.0)
+
+    async def put(self, job: Job) -> bool:
+        return await self.put_many([job]) == 1
+
+    @abstractmethod
+    async def put_many(self, jobs: Iterable[Job]) -> int:
+        pass
+
+    @abstractmethod
+    async def lease(self, limit: int = 1) -> list[Job]:
+        pass
+
+    @abstractmethod
+    async def complete(self, job: Job, follow_ups: Iterable[Job] = ()) -> bool:
+        pass
+
+    @abstractmethod
+    async def fail(self, job: Job, error: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def reclaim(self) -> int:
+        pass
+
+    @abstractmethod
+    async def extend(self, jobs: Iterable[Job]) -> None:
+        pass
+
+    @abstractmethod
+    async def counts(self) -> dict[str, int]:
+        pass
+
+    async def is_idle(self) -> bool:
+        counts = await self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "JobQueue":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -0,0 +1,245 @@
+import json
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+from src.config import settings
+from src.jobs.base import Job, JobQueue
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+_ENQUEUE = """
+local function enqueue(prefix, encoded, now)
+    local job = cjson.decode(encoded)
+    if redis.call('HEXISTS', prefix .. ':keys', job.key) == 1 then
+        return 0
+    end
+    local id = tostring(redis.call('INCR', prefix .. ':next_id'))
+    redis.call('HSET', prefix .. ':job:' .. id, 'key', job.key, 'kind', job.kind,
+        'source', job.source, 'shard', job.shard, 'payload', job.payload, 'attempts', 0)
+    redis.call('HSET', prefix .. ':keys', job.key, id)
+    redis.call('ZADD', prefix .. ':ready:' .. job.shard, now, id)
+    return 1
+end
+
+local function bury(prefix, id, shard, err)
+    local job_key = prefix .. ':job:' .. id
+    redis.call('HDEL', prefix .. ':keys', redis.call('HGET', job_key, 'key'))
+    redis.call('HSET', job_key, 'error', err)
+    redis.call('HDEL', job_key, 'owner')
+    redis.call('SADD', prefix .. ':dead:' .. shard, id)
+end
+"""
+
+_PUT = _ENQUEUE + """
+local inserted = 0
+for i = 3, #ARGV do
+    inserted = inserted + enqueue(ARGV[1], ARGV[i], tonumber(ARGV[2]))
+end
+return inserted
+"""
+
+_LEASE = _ENQUEUE + """
+local prefix, now, lease_until = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local limit, owner, max_attempts = tonumber(ARGV[4]), ARGV[5], tonumber(ARGV[6])
+local leased = {}
+
+for i = 7, #ARGV do
+    local shard = ARGV[i]
+    local leased_key = prefix .. ':leased:' .. shard
+    local ready_key = prefix .. ':ready:' .. shard
+
+    for _, id in ipairs(redis.call('ZRANGEBYSCORE', leased_key, '-inf', '(' .. now)) do
+        redis.call('ZREM', leased_key, id)
+        local attempts = tonumber(redis.call('HGET', prefix .. ':job:' .. id, 'attempts'))
+        if attempts >= max_attempts then
+            bury(prefix, id, shard, 'lease expired')
+        else
+            redis.call('ZADD', ready_key, now, id)
+        end
+    end
+
+    if #leased < limit then
+        local ids = redis.call('ZRANGEBYSCORE', ready_key, '-inf', now, 'LIMIT', 0, limit - #leased)
+        for _, id in ipairs(ids) do
+            local job_key = prefix .. ':job:' .. id
+            redis.call('ZREM', ready_key, id)
+            redis.call('ZADD', leased_key, lease_until, id)
+            local attempts = redis.call('HINCRBY', job_key, 'attempts', 1)
+            redis.call('HSET', job_key, 'owner', owner)
+            local fields = redis.call('HMGET', job_key, 'kind', 'source', 'key', 'payload', 'shard')
+            table.insert(leased, {id, fields[1], fields[2], fields[3], fields[4], fields[5], attempts})
+        end
+    end
+end
+return leased
+"""
+
+_OWNED = """
+local function owned(prefix, id, owner)
+    local job_key = prefix .. ':job:' .. id
+    local fields = redis.call('HMGET', job_key, 'owner', 'shard')
+    if fields[1] ~= owner then
+        return nil
+    end
+    if not redis.call('ZSCORE', prefix .. ':leased:' .. fields[2], id) then
+        return nil
+    end
+    return fields[2]
+end
+"""
+
+_COMPLETE = _ENQUEUE + _OWNED + """
+local prefix, now, id, owner = ARGV[1], tonumber(ARGV[2]), ARGV[3], ARGV[4]
+local shard = owned(prefix, id, owner)
+if not shard then
+    return 0
+end
+local job_key = prefix .. ':job:' .. id
+redis.call('ZREM', prefix .. ':leased:' .. shard, id)
+redis.call('HDEL', prefix .. ':keys', redis.call('HGET', job_key, 'key'))
+redis.call('DEL', job_key)
+for i = 5, #ARGV do
+    enqueue(prefix, ARGV[i], now)
+end
+return 1
+"""
+
+_FAIL = _ENQUEUE + _OWNED + """
+local prefix, id, owner = ARGV[1], ARGV[2], ARGV[3]
+local available_at, dead, err = tonumber(ARGV[4]), ARGV[5] == '1', ARGV[6]
+local shard = owned(prefix, id, owner)
+if not shard then
+    return 0
+end
+redis.call('ZREM', prefix .. ':leased:' .. shard, id)
+if dead then
+    bury(prefix, id, shard, err)
+else
+    redis.call('HSET', prefix .. ':job:' .. id, 'error', err)
+    redis.call('HDEL', prefix .. ':job:' .. id, 'owner')
+    redis.call('ZADD', prefix .. ':ready:' .. shard, available_at, id)
+end
+return 1
+"""
+
+_EXTEND = _OWNED + """
+local prefix, lease_until, owner = ARGV[1], tonumber(ARGV[2]), ARGV[3]
+for i = 4, #ARGV do
+    local shard = owned(prefix, ARGV[i], owner)
+    if shard then
+        redis.call('ZADD', prefix .. ':leased:' .. shard, 'XX', lease_until, ARGV[i])
+    end
+end
+return 0
+"""
+
+_RECLAIM = """
+local prefix, now, owner = ARGV[1], tonumber(ARGV[2]), ARGV[3]
+local reclaimed = 0
+for i = 4, #ARGV do
+    local leased_key = prefix .. ':leased:' .. ARGV[i]
+    for _, id in ipairs(redis.call('ZRANGE', leased_key, 0, -1)) do
+        local job_key = prefix .. ':job:' .. id
+        if redis.call('HGET', job_key, 'owner') == owner then
+            redis.call('ZREM', leased_key, id)
+            redis.call('HDEL', job_key, 'owner')
+            redis.call('ZADD', prefix .. ':ready:' .. ARGV[i], now, id)
+            reclaimed = reclaimed + 1
+        end
+    end
+end
+return reclaimed
+"""
+
+
+class RedisJobQueue(JobQueue):
+    def __init__(
+        self,
+        url: str = settings.job_queue_url,
+        prefix: str = "scraper:jobs",
+        client: Optional["redis.Redis"] = None,
+        **kwargs,
+    ):
+        if redis is None and client is None:
+            raise ImportError("The Redis job queue requires the redis package")
+        super().__init__(**kwargs)
+        self.prefix = prefix
+        self.redis = client or redis.Redis.from_url(url)
+        self._put = self.redis.register_script(_PUT)
+        self._lease = self.redis.register_script(_LEASE)
+        self._complete = self.redis.register_script(_COMPLETE)
+        self._fail = self.redis.register_script(_FAIL)
+        self._extend = self.redis.register_script(_EXTEND)
+        self._reclaim = self.redis.register_script(_RECLAIM)
+
+    def _encode(self, job: Job) -> str:
+        return json.dumps({
+            "key": job.key,
+            "kind": job.kind,
+            "source": job.source,
+            "shard": job.shard,
+            "payload": json.dumps(job.payload),
+        })
+
+    async def put_many(self, jobs: Iterable[Job]) -> int:
+        encoded = [self._encode(job) for job in jobs]
+        if not encoded:
+            return 0
+        return int(await self._put(args=[self.prefix, time.time(), *encoded]))
+
+    async def lease(self, limit: int = 1) -> list[Job]:
+        now = time.time()
+        rows = await self._lease(args=[
+            self.prefix, now, now + self.lease_seconds, limit, self.worker_id,
+            self.max_attempts, *self.shards,
+        ])
+        return [
+            Job(kind=kind.decode(), source=source.decode(), key=key.decode(),
+                payload=json.loads(payload), shard=int(shard), id=job_id.decode(),
+                attempts=int(attempts))
+            for job_id, kind, source, key, payload, shard, attempts in rows
+        ]
+
+    async def complete(self, job: Job, follow_ups: Iterable[Job] = ()) -> bool:
+        encoded = [self._encode(follow_up) for follow_up in follow_ups]
+        return bool(await self._complete(
+            args=[self.prefix, time.time(), job.id, self.worker_id, *encoded]))
+
+    async def fail(self, job: Job, error: str) -> bool:
+        dead = job.attempts >= self.max_attempts
+        await self._fail(args=[
+            self.prefix, job.id, self.worker_id,
+            time.time() + self.retry_delay(job.attempts), int(dead), error,
+        ])
+        return dead
+
+    async def reclaim(self) -> int:
+        return int(await self._reclaim(
+            args=[self.prefix, time.time(), self.worker_id, *self.shards]))
+
+    async def extend(self, jobs: Iterable[Job]) -> None:
+        ids = [job.id for job in jobs]
+        if ids:
+            await self._extend(
+                args=[self.prefix, time.time() + self.lease_seconds, self.worker_id, *ids])
+
+    async def counts(self) -> dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "dead": 0}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for shard in self.shards:
+                pipe.zcard(f"{self.prefix}:ready:{shard}")
+                pipe.zcard(f"{self.prefix}:leased:{shard}")
+                pipe.scard(f"{self.prefix}:dead:{shard}")
+            values = await pipe.execute()
+        for i in range(0, len(values), 3):
+            counts["pending"] += values[i]
+            counts["leased"] += values[i + 1]
+            counts["dead"] += values[i + 2]
+        return counts
+
+    async def close(self) -> None:
+        await self.redis.aclose()
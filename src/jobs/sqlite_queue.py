@@ -0,0 +1,181 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+from src.jobs.base import Job, JobQueue
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL,
+    error TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_live_key ON jobs (key) WHERE status != 'dead';
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (shard, status, available_at);
+"""
+
+
+class SqliteJobQueue(JobQueue):
+    def __init__(self, path: Optional[str | Path] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(
+            path or settings.job_queue_path or Path(settings.download_dir) / "jobs.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._shard_filter = ",".join(str(shard) for shard in self.shards)
+
+    def _transaction(self, func, *args):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    async def _run(self, func, *args):
+        return await asyncio.to_thread(self._transaction, func, *args)
+
+    def _insert(self, jobs: Iterable[Job], now: float) -> int:
+        inserted = 0
+        for job in jobs:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO jobs (key, kind, source, shard, payload, available_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (job.key, job.kind, job.source, job.shard, json.dumps(job.payload), now),
+            )
+            inserted += cursor.rowcount
+        return inserted
+
+    async def put_many(self, jobs: Iterable[Job]) -> int:
+        return await self._run(self._insert, list(jobs), time.time())
+
+    def _lease(self, limit: int, now: float) -> list[Job]:
+        self._conn.execute(
+            f"""
+            UPDATE jobs SET status = 'dead', owner = NULL, error = 'lease expired'
+            WHERE status = 'leased' AND lease_until < ? AND attempts >= ?
+                AND shard IN ({self._shard_filter})
+            """,
+            (now, self.max_attempts),
+        )
+        rows = self._conn.execute(
+            f"""
+            SELECT id, kind, source, key, payload, shard, attempts FROM jobs
+            WHERE shard IN ({self._shard_filter})
+                AND ((status = 'pending' AND available_at <= ?)
+                     OR (status = 'leased' AND lease_until < ?))
+            ORDER BY available_at, id
+            LIMIT ?
+            """,
+            (now, now, limit),
+        ).fetchall()
+
+        self._conn.executemany(
+            """
+            UPDATE jobs SET status = 'leased', owner = ?, lease_until = ?,
+                attempts = attempts + 1
+            WHERE id = ?
+            """,
+            [(self.worker_id, now + self.lease_seconds, row[0]) for row in rows],
+        )
+        return [
+            Job(kind=kind, source=source, key=key, payload=json.loads(payload),
+                shard=shard, id=str(job_id), attempts=attempts + 1)
+            for job_id, kind, source, key, payload, shard, attempts in rows
+        ]
+
+    async def lease(self, limit: int = 1) -> list[Job]:
+        return await self._run(self._lease, limit, time.time())
+
+    def _complete(self, job: Job, follow_ups: list[Job], now: float) -> bool:
+        cursor = self._conn.execute(
+            "DELETE FROM jobs WHERE id = ? AND owner = ? AND status = 'leased'",
+            (int(job.id), self.worker_id),
+        )
+        if cursor.rowcount == 0:
+            return False
+        self._insert(follow_ups, now)
+        return True
+
+    async def complete(self, job: Job, follow_ups: Iterable[Job] = ()) -> bool:
+        return await self._run(self._complete, job, list(follow_ups), time.time())
+
+    def _fail(self, job: Job, error: str, now: float) -> bool:
+        dead = job.attempts >= self.max_attempts
+        self._conn.execute(
+            """
+            UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL,
+                available_at = ?, error = ?
+            WHERE id = ? AND owner = ? AND status = 'leased'
+            """,
+            ("dead" if dead else "pending", now + self.retry_delay(job.attempts), error,
+             int(job.id), self.worker_id),
+        )
+        return dead
+
+    async def fail(self, job: Job, error: str) -> bool:
+        return await self._run(self._fail, job, error, time.time())
+
+    def _reclaim(self, now: float) -> int:
+        cursor = self._conn.execute(
+            f"""
+            UPDATE jobs SET status = 'pending', owner = NULL, lease_until = NULL, available_at = ?
+            WHERE status = 'leased' AND owner = ? AND shard IN ({self._shard_filter})
+            """,
+            (now, self.worker_id),
+        )
+        return cursor.rowcount
+
+    async def reclaim(self) -> int:
+        return await self._run(self._reclaim, time.time())
+
+    def _extend(self, ids: list[int], lease_until: float) -> None:
+        self._conn.executemany(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = 'leased'",
+            [(lease_until, job_id, self.worker_id) for job_id in ids],
+        )
+
+    async def extend(self, jobs: Iterable[Job]) -> None:
+        ids = [int(job.id) for job in jobs]
+        if ids:
+            await self._run(self._extend, ids, time.time() + self.lease_seconds)
+
+    def _counts(self) -> dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "dead": 0}
+        rows = self._conn.execute(
+            f"SELECT status, COUNT(*) FROM jobs WHERE shard IN ({self._shard_filter}) GROUP BY status"
+        )
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    async def counts(self) -> dict[str, int]:
+        return await self._run(self._counts)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,195 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Optional
+
+import aiohttp
+
+from src.config import ExamSource, settings
+from src.jobs.base import Job, JobQueue
+from src.models import Exam
+from src.pipeline import ExamResult
+from src.scrapers import BaseScraper
+from src.services import PdfExtractor
+
+_DONE = object()
+
+
+class CrawlWorker:
+    def __init__(
+        self,
+        queue: JobQueue,
+        scraper: BaseScraper,
+        extractor: PdfExtractor,
+        concurrency: int = settings.job_worker_concurrency,
+        poll_interval: float = settings.job_poll_interval,
+        queue_size: int = settings.pipeline_queue_size,
+        commit_interval: float = settings.output_flush_seconds,
+    ):
+        self.queue = queue
+        self.scraper = scraper
+        self.extractor = extractor
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.commit_interval = commit_interval
+        self._in_flight: dict[str, Job] = {}
+        self._uncommitted: list[tuple[Job, list[Job]]] = []
+        self._commit_lock = asyncio.Lock()
+        self._flush: Optional[Callable[[], Awaitable[None]]] = None
+
+    async def seed(self, sources: Iterable[ExamSource]) -> int:
+        return await self.queue.put_many(
+            self._listing_job(source.name, source.base_url, 1) for source in sources)
+
+    def _listing_job(self, source: str, base_url: str, page: int) -> Job:
+        return self.queue.job(
+            "listing", source, f"listing:{base_url}:{page}", {"base_url": base_url, "page": page})
+
+    async def run(
+        self, flush: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> AsyncIterator[ExamResult]:
+        self._flush = flush
+        reclaimed = await self.queue.reclaim()
+        if reclaimed:
+            print(f"Reclaimed {reclaimed} jobs leased by {self.queue.worker_id}")
+
+        results: asyncio.Queue = asyncio.Queue(self.queue_size)
+        tasks = [
+            asyncio.create_task(self._run_workers(results)),
+            asyncio.create_task(self._heartbeat()),
+        ]
+        if flush is not None:
+            tasks.append(asyncio.create_task(self._commit_periodically()))
+
+        try:
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+                result, consumed = item
+                yield result
+                consumed.set()
+            await tasks[0]
+            await self.commit()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def commit(self) -> None:
+        async with self._commit_lock:
+            if not self._uncommitted:
+                return
+            jobs, self._uncommitted = self._uncommitted, []
+            try:
+                await self._flush()
+            except BaseException:
+                self._uncommitted = jobs + self._uncommitted
+                raise
+            for job, follow_ups in jobs:
+                if not await self.queue.complete(job, follow_ups):
+                    print(f"Lost lease on job {job.key}")
+
+    async def _commit_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.commit_interval)
+            await self.commit()
+
+    async def _run_workers(self, results: asyncio.Queue) -> None:
+        try:
+            await asyncio.gather(*(self._work(results) for _ in range(self.concurrency)))
+        finally:
+            await results.put(_DONE)
+
+    async def _work(self, results: asyncio.Queue) -> None:
+        while True:
+            jobs = await self.queue.lease(1)
+            if not jobs:
+                if self._uncommitted:
+                    await self.commit()
+                    continue
+                if not self._in_flight and await self.queue.is_idle():
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            job = jobs[0]
+            self._in_flight[job.id] = job
+            try:
+                await self._process(job, results)
+            finally:
+                del self._in_flight[job.id]
+
+    async def _process(self, job: Job, results: asyncio.Queue) -> None:
+        handler = getattr(self, f"_handle_{job.kind}")
+        try:
+            follow_ups, job_results = await handler(job)
+        except Exception as e:
+            print(f"Job {job.key} failed (attempt {job.attempts}): {e}")
+            if await self.queue.fail(job, str(e)) and job.kind != "listing":
+                exam = Exam.from_dict(job.payload["exam"])
+                await self._emit([ExamResult(source=job.source, exam=exam, error=str(e))], results)
+            return
+
+        await self._emit(job_results, results)
+        if job_results and self._flush is not None:
+            self._uncommitted.append((job, follow_ups))
+        elif not await self.queue.complete(job, follow_ups):
+            print(f"Lost lease on job {job.key}")
+
+    async def _emit(self, job_results: list[ExamResult], results: asyncio.Queue) -> None:
+        consumed = []
+        for result in job_results:
+            event = asyncio.Event()
+            await results.put((result, event))
+            consumed.append(event)
+        await asyncio.gather(*(event.wait() for event in consumed))
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            await self.queue.extend(
+                [*self._in_flight.values(), *(job for job, _ in self._uncommitted)])
+
+    async def _handle_listing(self, job: Job) -> tuple[list[Job], list[ExamResult]]:
+        base_url, page = job.payload["base_url"], job.payload["page"]
+        try:
+            exams = await self.scraper.fetch_exam_list(base_url, page)
+        except aiohttp.ClientResponseError as e:
+            if e.status != 404:
+                raise
+            exams = []
+
+        if not exams:
+            print(f"No more exams found at page {page}")
+            return [], []
+
+        if self.scraper.incremental:
+            known = self.scraper.state.processed(exam.page_url for exam in exams)
+            if all(exam.page_url in known for exam in exams):
+                print(f"Page {page} has only known exams, stopping")
+                return [], []
+
+        follow_ups = [
+            self.queue.job("enrich", job.source, f"enrich:{exam.page_url}", {"exam": exam.to_dict()})
+            for exam in exams
+        ]
+        follow_ups.append(self._listing_job(job.source, base_url, page + 1))
+        return follow_ups, []
+
+    async def _handle_enrich(self, job: Job) -> tuple[list[Job], list[ExamResult]]:
+        exam = await self.scraper.enrich_exam(Exam.from_dict(job.payload["exam"]))
+        if exam.download.answer_key_url:
+            return [self.queue.job("pdf", job.source, f"pdf:{exam.page_url}", {"exam": exam.to_dict()})], []
+        return [], [ExamResult(source=job.source, exam=exam)]
+
+    async def _handle_pdf(self, job: Job) -> tuple[list[Job], list[ExamResult]]:
+        exam = Exam.from_dict(job.payload["exam"])
+        pdf = await self.extractor.download_pdf(exam.download.answer_key_url, pin=True)
+        try:
+            answer_keys = await self.extractor.extract_answer_keys_stored(pdf)
+        finally:
+            self.extractor.store.unpin(pdf.sha256)
+        return [], [ExamResult(
+            source=job.source, exam=exam, answer_keys=answer_keys,
+            pdf_sha256=pdf.sha256, duplicate_of=self.extractor.duplicate_of(pdf.sha256))]
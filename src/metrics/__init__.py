@@ -0,0 +1,39 @@
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.metrics.registry import Counter, Histogram, MetricsRegistry, metrics
+    from src.metrics.sinks import (
+        LogSummarySink,
+        MetricsSink,
+        PrometheusSink,
+        configured_sinks,
+        render_prometheus,
+        summarize,
+    )
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.metrics.registry": ("Counter", "Histogram", "MetricsRegistry", "metrics"),
+    "src.metrics.sinks": (
+        "LogSummarySink",
+        "MetricsSink",
+        "PrometheusSink",
+        "configured_sinks",
+        "render_prometheus",
+        "summarize",
+    ),
+})
+
+__all__ = [
+    "metrics",
+    "MetricsRegistry",
+    "Counter",
+    "Histogram",
+    "MetricsSink",
+    "PrometheusSink",
+    "LogSummarySink",
+    "render_prometheus",
+    "summarize",
+    "configured_sinks",
+]
@@ -0,0 +1,36 @@
+from src.metrics.registry import metrics
+
+SIZE_BUCKETS = (0, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HTTP_REQUESTS = metrics.counter(
+    "scraper_http_requests_total", "HTTP responses received", ("kind", "status"))
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "scraper_http_request_seconds", "Time until HTTP response headers arrive", ("kind",))
+HTTP_RESPONSE_BYTES = metrics.counter(
+    "scraper_http_response_bytes_total", "HTTP response body bytes read", ("kind",))
+HTTP_RETRIES = metrics.counter(
+    "scraper_http_retries_total", "Retried HTTP fetches", ("kind",))
+HTTP_CACHE = metrics.counter(
+    "scraper_http_cache_total", "HTTP cache lookups by outcome", ("kind", "result"))
+
+ENRICH = metrics.counter(
+    "scraper_enrich_total", "Download-page enrichments by outcome", ("result",))
+ENRICH_SECONDS = metrics.histogram(
+    "scraper_enrich_seconds", "Time spent enriching one exam")
+
+PDF_PAGES = metrics.counter(
+    "scraper_pdf_pages_total", "PDF pages extracted")
+PDF_PAGE_SECONDS = metrics.histogram(
+    "scraper_pdf_page_seconds", "Text extraction time per PDF page")
+PDF_EXTRACT_SECONDS = metrics.histogram(
+    "scraper_pdf_extract_seconds", "Time spent extracting one PDF", ("operation",))
+ANSWER_KEY_PARSE_SECONDS = metrics.histogram(
+    "scraper_answer_key_parse_seconds", "Time spent parsing answer keys from text")
+ANSWER_KEYS = metrics.counter(
+    "scraper_answer_keys_total", "Answer keys extracted")
+ANSWERS_PER_PDF = metrics.histogram(
+    "scraper_answers_per_pdf", "Answers extracted per answer-key PDF", buckets=SIZE_BUCKETS)
+EXTRACTION_CACHE = metrics.counter(
+    "scraper_extraction_cache_total", "Extraction results cache lookups", ("component", "result"))
+NEAR_DUPLICATES = metrics.counter(
+    "scraper_near_duplicates_total", "Answer-key PDFs detected as near-duplicates", ("kind",))
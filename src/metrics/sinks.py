@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from aiohttp import web
+
+from src.config import settings
+from src.metrics.registry import Counter, Histogram, MetricsRegistry, metrics
+
+logger = logging.getLogger("scraper.metrics")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = list(zip(labelnames, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_prometheus(registry: MetricsRegistry = metrics) -> str:
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+
+        if isinstance(metric, Counter):
+            for key, value in metric.samples().items():
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+        elif isinstance(metric, Histogram):
+            for key, state in metric.samples().items():
+                cumulative = 0.0
+                for bound, count in zip(metric.buckets + (math.inf,), state):
+                    cumulative += count
+                    labels = _format_labels(metric.labelnames, key, le=_format_value(bound))
+                    lines.append(f"{metric.name}_bucket{labels} {_format_value(cumulative)}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(state[-2])}")
+                lines.append(f"{metric.name}_count{labels} {_format_value(state[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def summarize(registry: MetricsRegistry = metrics) -> dict:
+    summary = {}
+    for metric in registry:
+        if isinstance(metric, Counter):
+            total = metric.total()
+            if total:
+                summary[metric.name] = total
+        elif isinstance(metric, Histogram):
+            samples = metric.samples().values()
+            count = sum(state[-1] for state in samples)
+            if count:
+                summary[metric.name] = {
+                    "count": int(count),
+                    "mean": round(sum(state[-2] for state in samples) / count, 4),
+                }
+    return summary
+
+
+class MetricsSink(ABC):
+    def __init__(self, registry: MetricsRegistry = metrics):
+        self.registry = registry
+
+    @abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "MetricsSink":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+
+class PrometheusSink(MetricsSink):
+    def __init__(
+        self, port: int, host: str = "127.0.0.1", registry: MetricsRegistry = metrics
+    ):
+        super().__init__(registry)
+        self.port = port
+        self.host = host
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=render_prometheus(self.registry),
+            content_type="text/plain",
+            headers={"X-Content-Type-Options": "nosniff"},
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class LogSummarySink(MetricsSink):
+    def __init__(self, interval: float, registry: MetricsRegistry = metrics):
+        super().__init__(registry)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def log_summary(self) -> None:
+        logger.info("metrics %s", json.dumps(summarize(self.registry), sort_keys=True))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.log_summary()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.log_summary()
+
+
+def configured_sinks(registry: MetricsRegistry = metrics) -> list[MetricsSink]:
+    sinks: list[MetricsSink] = []
+    if settings.metrics_port:
+        sinks.append(PrometheusSink(settings.metrics_port, settings.metrics_host, registry))
+    if settings.metrics_log_interval:
+        sinks.append(LogSummarySink(settings.metrics_log_interval, registry))
+    return sinks
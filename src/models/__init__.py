@@ -1,3 +1,14 @@
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+from src.models.answer_key import AnswerKey
 from src.models.exam import Exam, ExamDownload
 
-__all__ = ["Exam", "ExamDownload"]
+if TYPE_CHECKING:
+    from src.models.catalog import CatalogDiff, CatalogRow, ExamCatalog
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.models.catalog": ("ExamCatalog", "CatalogRow", "CatalogDiff"),
+})
+
+__all__ = ["Exam", "ExamDownload", "AnswerKey", "ExamCatalog", "CatalogRow", "CatalogDiff"]
@@ -0,0 +1,121 @@
+from collections.abc import Iterator, Mapping
+from typing import Optional, Union
+
+BLANK = "-"
+ANNULLED = "X"
+VALID_ANSWERS = frozenset("ABCDEX")
+
+
+class AnswerView(Mapping[int, str]):
+    __slots__ = ("_packed",)
+
+    def __init__(self, packed: bytes):
+        self._packed = packed
+
+    def __getitem__(self, question: int) -> str:
+        if isinstance(question, int) and 1 <= question <= len(self._packed):
+            code = self._packed[question - 1]
+            if code != ord(BLANK):
+                return chr(code)
+        raise KeyError(question)
+
+    def __iter__(self) -> Iterator[int]:
+        blank = ord(BLANK)
+        return (index + 1 for index, code in enumerate(self._packed) if code != blank)
+
+    def __len__(self) -> int:
+        return len(self._packed) - self._packed.count(BLANK.encode("ascii"))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class AnswerKey:
+    __slots__ = ("exam_name", "tipo", "packed")
+
+    def __init__(
+        self,
+        exam_name: str,
+        tipo: str,
+        answers: Union[Mapping[int, str], bytes, str],
+    ):
+        self.exam_name = exam_name
+        self.tipo = tipo
+        self.packed = self.pack(answers)
+
+    @staticmethod
+    def pack(answers: Union[Mapping[int, str], bytes, str]) -> bytes:
+        if isinstance(answers, bytes):
+            return answers.upper()
+        if isinstance(answers, str):
+            return answers.upper().encode("ascii")
+        if not answers:
+            return b""
+
+        packed = bytearray(BLANK.encode("ascii") * max(answers))
+        for num, letter in answers.items():
+            if num >= 1:
+                packed[num - 1] = ord(letter.upper())
+        return bytes(packed)
+
+    @property
+    def num_questions(self) -> int:
+        return len(self.packed)
+
+    @property
+    def num_answers(self) -> int:
+        return len(self.packed) - self.packed.count(BLANK.encode("ascii"))
+
+    @property
+    def answers(self) -> Mapping[int, str]:
+        return AnswerView(self.packed)
+
+    def items(self) -> Iterator[tuple[int, str]]:
+        blank = ord(BLANK)
+        for index, code in enumerate(self.packed):
+            if code != blank:
+                yield index + 1, chr(code)
+
+    def get(self, question: int) -> Optional[str]:
+        if not 1 <= question <= len(self.packed):
+            return None
+        letter = chr(self.packed[question - 1])
+        return None if letter == BLANK else letter
+
+    def answer_string(self, blank: str = BLANK) -> str:
+        text = self.packed.decode("ascii")
+        return text if blank == BLANK else text.replace(BLANK, blank)
+
+    def as_array(self):
+        import numpy as np
+
+        return np.frombuffer(self.packed, dtype=np.uint8)
+
+    def to_row(self) -> dict:
+        return {
+            "exam_name": self.exam_name,
+            "tipo": self.tipo,
+            "num_questions": self.num_answers,
+            "answers": self.answer_string(),
+        }
+
+    def __len__(self) -> int:
+        return self.num_answers
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AnswerKey):
+            return NotImplemented
+        return (self.exam_name, self.tipo, self.packed) == (other.exam_name, other.tipo, other.packed)
+
+    def __hash__(self) -> int:
+        return hash((self.exam_name, self.tipo, self.packed))
+
+    def __repr__(self) -> str:
+        return (f"AnswerKey(exam_name={self.exam_name!r}, tipo={self.tipo!r}, "
+                f"answers={self.answer_string()!r})")
+
+    def __getstate__(self) -> tuple[str, str, bytes]:
+        return self.exam_name, self.tipo, self.packed
+
+    def __setstate__(self, state: tuple[str, str, bytes]) -> None:
+        self.exam_name, self.tipo, self.packed = state
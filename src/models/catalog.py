@@ -0,0 +1,377 @@
+import hashlib
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.models.exam import Exam, ExamDownload
+
+MAGIC = b"EXAMCAT1"
+FLUSH_ROWS = 65536
+
+CATEGORICAL = ("source", "year", "organization", "institution", "level")
+STRINGS = ("name", "page_url", "exam_url", "answer_key_url")
+URL_COLUMNS = ("page_url", "exam_url", "answer_key_url")
+COLUMNS = ("source", "name", "year", "organization", "institution", "level",
+           "page_url", "exam_url", "answer_key_url")
+ALIASES = {"banca": "institution"}
+
+_DICTIONARIES = CATEGORICAL + tuple(f"{column}_prefix" for column in URL_COLUMNS)
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _split_url(url: Optional[str]) -> tuple[Optional[str], str]:
+    if url is None:
+        return None, ""
+    path = url.find("/", url.find("//") + 2)
+    if path < 0:
+        return url, ""
+    return url[:path], url[path:]
+
+
+def _code_dtype(size: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def _column_property(column: str) -> property:
+    return property(lambda self: self.catalog.value(column, self.row))
+
+
+class CatalogRow:
+    __slots__ = ("catalog", "row")
+
+    def __init__(self, catalog: "ExamCatalog", row: int):
+        self.catalog = catalog
+        self.row = row
+
+    source = _column_property("source")
+    name = _column_property("name")
+    year = _column_property("year")
+    organization = _column_property("organization")
+    institution = _column_property("institution")
+    banca = _column_property("institution")
+    level = _column_property("level")
+    page_url = _column_property("page_url")
+    exam_url = _column_property("exam_url")
+    answer_key_url = _column_property("answer_key_url")
+
+    def to_exam(self) -> Exam:
+        return Exam(
+            name=self.name,
+            year=self.year,
+            organization=self.organization,
+            institution=self.institution,
+            level=self.level,
+            page_url=self.page_url,
+            download=ExamDownload(exam_url=self.exam_url, answer_key_url=self.answer_key_url),
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CatalogRow) and (self.catalog, self.row) == (other.catalog, other.row)
+
+    def __hash__(self) -> int:
+        return hash((id(self.catalog), self.row))
+
+    def __repr__(self) -> str:
+        return f"CatalogRow(row={self.row}, page_url={self.page_url!r}, name={self.name!r})"
+
+
+@dataclass
+class CatalogDiff:
+    added: np.ndarray
+    removed: np.ndarray
+    changed: np.ndarray
+
+    def __bool__(self) -> bool:
+        return bool(len(self.added) or len(self.removed) or len(self.changed))
+
+
+class ExamCatalog:
+    def __init__(self):
+        self._mmap: Optional[mmap.mmap] = None
+        self._size = 0
+        self._values: dict[str, list[Optional[str]]] = {name: [] for name in _DICTIONARIES}
+        self._lookup: dict[str, dict[Optional[str], int]] = {name: {} for name in _DICTIONARIES}
+        self._arrays: dict[str, np.ndarray] = {
+            **{name: np.empty(0, np.uint8) for name in _DICTIONARIES},
+            **{f"blob/{name}": np.empty(0, np.uint8) for name in STRINGS},
+            **{f"offsets/{name}": np.zeros(1, np.uint64) for name in STRINGS},
+            "hashes": np.empty(0, np.uint64),
+            "fingerprints": np.empty(0, np.uint64),
+        }
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._sorted: Optional[tuple[np.ndarray, np.ndarray]] = None
+        self._pending: dict[str, list] = {name: [] for name in (*COLUMNS, "hashes", "fingerprints")}
+        self._pending_urls: dict[int, int] = {}
+
+    @classmethod
+    def from_exams(cls, exams: Iterable[Exam], source: Optional[str] = None) -> "ExamCatalog":
+        catalog = cls()
+        catalog.add_many(exams, source)
+        return catalog
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending["hashes"])
+
+    def __iter__(self) -> Iterator[CatalogRow]:
+        return (CatalogRow(self, row) for row in range(len(self)))
+
+    def __getitem__(self, row: int) -> CatalogRow:
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return CatalogRow(self, row)
+
+    def __contains__(self, page_url: str) -> bool:
+        return self.row_of(page_url) is not None
+
+    def add(self, exam: Exam, source: Optional[str] = None) -> int:
+        row = self.row_of(exam.page_url)
+        if row is not None:
+            return row
+
+        values = (
+            source, exam.name, exam.year, exam.organization, exam.institution, exam.level,
+            exam.page_url, exam.download.exam_url, exam.download.answer_key_url,
+        )
+        for column, value in zip(COLUMNS, values):
+            self._pending[column].append(value)
+        url_hash = _hash(exam.page_url)
+        self._pending["hashes"].append(url_hash)
+        self._pending["fingerprints"].append(_hash("\x1f".join(value or "" for value in values)))
+        row = len(self) - 1
+        self._pending_urls[url_hash] = row
+        if len(self._pending_urls) >= FLUSH_ROWS:
+            self._flush()
+        return row
+
+    def add_many(self, exams: Iterable[Exam], source: Optional[str] = None) -> None:
+        for exam in exams:
+            self.add(exam, source)
+
+    def row_of(self, page_url: str) -> Optional[int]:
+        url_hash = _hash(page_url)
+        row = self._pending_urls.get(url_hash)
+        if row is not None:
+            if self.value("page_url", row) == page_url:
+                return row
+            pending = zip(self._pending["hashes"], self._pending["page_url"])
+            for offset, (other, url) in enumerate(pending):
+                if other == url_hash and url == page_url:
+                    return self._size + offset
+        if not self._size:
+            return None
+
+        order, hashes = self._sorted_hashes()
+        position = int(np.searchsorted(hashes, np.uint64(url_hash)))
+        while position < len(hashes) and hashes[position] == url_hash:
+            row = int(order[position])
+            if self.value("page_url", row) == page_url:
+                return row
+            position += 1
+        return None
+
+    def get(self, page_url: str) -> Optional[CatalogRow]:
+        row = self.row_of(page_url)
+        return CatalogRow(self, row) if row is not None else None
+
+    def value(self, column: str, row: int) -> Optional[str]:
+        column = ALIASES.get(column, column)
+        if row >= self._size:
+            return self._pending[column][row - self._size]
+        if column in CATEGORICAL:
+            return self._values[column][self._arrays[column][row]]
+
+        offsets = self._arrays[f"offsets/{column}"]
+        text = self._arrays[f"blob/{column}"][offsets[row]:offsets[row + 1]].tobytes().decode("utf-8")
+        if column in URL_COLUMNS:
+            prefix = self._values[f"{column}_prefix"][self._arrays[f"{column}_prefix"][row]]
+            return None if prefix is None else prefix + text
+        return text
+
+    def rows(self, **filters) -> np.ndarray:
+        self._flush()
+        result = None
+        for column, value in filters.items():
+            if value is None:
+                continue
+            column = ALIASES.get(column, column)
+            if column not in CATEGORICAL:
+                raise ValueError(f"Cannot filter the catalog by {column}")
+            code = self._lookup[column].get(str(value))
+            if code is None:
+                return np.empty(0, np.uint32)
+            order, starts = self._column_postings(column)
+            rows = order[starts[code]:starts[code + 1]]
+            result = np.array(rows) if result is None else np.intersect1d(result, rows, assume_unique=True)
+        if result is None:
+            return np.arange(self._size, dtype=np.uint32)
+        return result
+
+    def find(self, **filters) -> Iterator[CatalogRow]:
+        return (CatalogRow(self, int(row)) for row in self.rows(**filters))
+
+    def counts(self, column: str) -> dict[Optional[str], int]:
+        self._flush()
+        column = ALIASES.get(column, column)
+        if column not in CATEGORICAL:
+            raise ValueError(f"Cannot count the catalog by {column}")
+        counts = np.bincount(self._arrays[column], minlength=len(self._values[column]))
+        return {value: int(count) for value, count in zip(self._values[column], counts) if count}
+
+    def diff(self, previous: "ExamCatalog") -> CatalogDiff:
+        self._flush()
+        previous._flush()
+        order, hashes = self._sorted_hashes()
+        previous_order, previous_hashes = previous._sorted_hashes()
+
+        kept = np.isin(hashes, previous_hashes, assume_unique=True)
+        still_there = np.isin(previous_hashes, hashes, assume_unique=True)
+        rows = order[kept]
+        previous_rows = previous_order[np.searchsorted(previous_hashes, hashes[kept])]
+        changed = rows[self._arrays["fingerprints"][rows] != previous._arrays["fingerprints"][previous_rows]]
+        return CatalogDiff(
+            added=np.sort(order[~kept]),
+            removed=np.sort(previous_order[~still_there]),
+            changed=np.sort(changed),
+        )
+
+    def _code(self, name: str, value: Optional[str]) -> int:
+        codes = self._lookup[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self._values[name].append(value)
+        return code
+
+    def _flush(self) -> None:
+        count = len(self._pending["hashes"])
+        if not count:
+            return
+
+        arrays = self._arrays
+        new: dict[str, np.ndarray] = {}
+        for column in CATEGORICAL:
+            new[column] = np.fromiter(
+                (self._code(column, value) for value in self._pending[column]), np.uint32, count)
+        for column in STRINGS:
+            texts = self._pending[column]
+            if column in URL_COLUMNS:
+                hosts, texts = zip(*map(_split_url, texts))
+                new[f"{column}_prefix"] = np.fromiter(
+                    (self._code(f"{column}_prefix", host) for host in hosts), np.uint32, count)
+            encoded = [(text or "").encode("utf-8") for text in texts]
+            offsets = arrays[f"offsets/{column}"]
+            lengths = np.fromiter(map(len, encoded), np.uint64, count)
+            new[f"offsets/{column}"] = offsets[-1] + np.cumsum(lengths, dtype=np.uint64)
+            new[f"blob/{column}"] = np.frombuffer(b"".join(encoded), np.uint8)
+        new["hashes"] = np.array(self._pending["hashes"], np.uint64)
+        new["fingerprints"] = np.array(self._pending["fingerprints"], np.uint64)
+
+        for name, values in new.items():
+            arrays[name] = np.concatenate([arrays[name], values])
+        self._size += count
+        self._pending = {name: [] for name in self._pending}
+        self._pending_urls = {}
+        self._postings = {}
+        self._sorted = None
+
+    def _sorted_hashes(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._sorted is None:
+            order = np.argsort(self._arrays["hashes"], kind="stable").astype(np.uint32)
+            self._sorted = (order, self._arrays["hashes"][order])
+        return self._sorted
+
+    def _column_postings(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        if column not in self._postings:
+            codes = self._arrays[column]
+            order = np.argsort(codes, kind="stable").astype(np.uint32)
+            counts = np.bincount(codes, minlength=len(self._values[column]))
+            starts = np.concatenate([[0], np.cumsum(counts)]).astype(np.uint64)
+            self._postings[column] = (order, starts)
+        return self._postings[column]
+
+    def save(self, path: str | Path) -> None:
+        self._flush()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = dict(self._arrays)
+        for name in _DICTIONARIES:
+            arrays[name] = arrays[name].astype(_code_dtype(len(self._values[name])))
+        arrays["hash_order"], arrays["sorted_hashes"] = self._sorted_hashes()
+        for column in CATEGORICAL:
+            arrays[f"order/{column}"], arrays[f"starts/{column}"] = self._column_postings(column)
+
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, offset, len(array)]
+            offset += -(-array.nbytes // 8) * 8
+        header = json.dumps(
+            {"rows": self._size, "values": self._values, "arrays": layout}, ensure_ascii=False
+        ).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+            for array in arrays.values():
+                f.write(array.tobytes())
+                f.write(b"\0" * (-array.nbytes % 8))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ExamCatalog":
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an exam catalog")
+            header_size = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_size))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        catalog = cls()
+        catalog._mmap = mapped
+        catalog._size = header["rows"]
+        catalog._values = header["values"]
+        catalog._lookup = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in catalog._values.items()
+        }
+        start = len(MAGIC) + 8 + header_size
+        arrays = {
+            name: np.frombuffer(mapped, np.dtype(dtype), count, start + offset)
+            for name, (dtype, offset, count) in header["arrays"].items()
+        }
+        catalog._sorted = (arrays.pop("hash_order"), arrays.pop("sorted_hashes"))
+        catalog._postings = {
+            column: (arrays.pop(f"order/{column}"), arrays.pop(f"starts/{column}"))
+            for column in CATEGORICAL
+        }
+        catalog._arrays = arrays
+        return catalog
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._arrays = {}
+            self._postings = {}
+            self._sorted = None
+            self._size = 0
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ExamCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -18,6 +18,22 @@ class Exam:
     page_url: str
     download: ExamDownload = field(default_factory=ExamDownload)
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Exam":
+        download = data.get("download") or {}
+        return cls(
+            name=data["name"],
+            year=data["year"],
+            organization=data["organization"],
+            institution=data["institution"],
+            level=data["level"],
+            page_url=data["page_url"],
+            download=ExamDownload(
+                exam_url=download.get("exam_url"),
+                answer_key_url=download.get("answer_key_url"),
+            ),
+        )
+
     def to_dict(self) -> dict:
         return {
             "name": self.name,
@@ -31,3 +47,15 @@ class Exam:
                 "answer_key_url": self.download.answer_key_url,
             },
         }
+
+    def to_row(self) -> dict:
+        return {
+            "name": self.name,
+            "year": self.year,
+            "organization": self.organization,
+            "institution": self.institution,
+            "level": self.level,
+            "page_url": self.page_url,
+            "exam_url": self.download.exam_url,
+            "answer_key_url": self.download.answer_key_url,
+        }
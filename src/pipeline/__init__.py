@@ -0,0 +1,12 @@
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.pipeline.exam_pipeline import ExamPipeline, ExamResult
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.pipeline.exam_pipeline": ("ExamPipeline", "ExamResult"),
+})
+
+__all__ = ["ExamPipeline", "ExamResult"]
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from src.config import ExamSource, settings
+from src.models import Exam
+from src.scrapers import BaseScraper
+from src.services import AnswerKey, PdfExtractor, StoredPdf
+
+_DONE = object()
+
+logger = logging.getLogger("scraper.pipeline")
+
+Handler = Callable[[Any, asyncio.Queue, asyncio.Queue], Awaitable[None]]
+
+
+@dataclass
+class ExamResult:
+    source: str
+    exam: Exam
+    answer_keys: list[AnswerKey] = field(default_factory=list)
+    error: Optional[str] = None
+    pdf_sha256: Optional[str] = None
+    duplicate_of: Optional[str] = None
+
+
+class ExamPipeline:
+    def __init__(
+        self,
+        scraper: BaseScraper,
+        extractor: PdfExtractor,
+        listing_concurrency: int = settings.listing_concurrency,
+        enrich_concurrency: int = settings.enrich_concurrency,
+        fetch_concurrency: int = settings.fetch_concurrency,
+        parse_concurrency: int = settings.parse_concurrency,
+        queue_size: int = settings.pipeline_queue_size,
+        parse_answer_keys: bool = True,
+    ):
+        self.scraper = scraper
+        self.extractor = extractor
+        self.listing_concurrency = listing_concurrency
+        self.enrich_concurrency = enrich_concurrency
+        self.fetch_concurrency = fetch_concurrency
+        self.parse_concurrency = parse_concurrency
+        self.queue_size = queue_size
+        self.parse_answer_keys = parse_answer_keys
+
+    async def run(self, sources: Iterable[ExamSource]) -> AsyncIterator[ExamResult]:
+        source_queue: asyncio.Queue = asyncio.Queue()
+        for source in sources:
+            source_queue.put_nowait(source)
+
+        listed: asyncio.Queue = asyncio.Queue(self.queue_size)
+        enriched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        fetched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        results: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        stages = [
+            (self.listing_concurrency, source_queue, listed, self._list),
+            (self.enrich_concurrency, listed, enriched, self._enrich),
+            (self.fetch_concurrency, enriched, fetched, self._fetch),
+            (self.parse_concurrency, fetched, results, self._parse),
+        ]
+        tasks = [
+            asyncio.create_task(self._run_stage(workers, inbox, outbox, results, handler))
+            for workers, inbox, outbox, handler in stages
+        ]
+        source_queue.put_nowait(_DONE)
+
+        try:
+            while True:
+                result = await results.get()
+                if result is _DONE:
+                    break
+                yield result
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_stage(
+        self,
+        workers: int,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        results: asyncio.Queue,
+        handler: Handler,
+    ) -> None:
+        async def worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    return
+                try:
+                    await handler(item, outbox, results)
+                except Exception as e:
+                    await self._failed(item, e, results)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            if not asyncio.current_task().cancelling():
+                await outbox.put(_DONE)
+
+    async def _failed(self, item: Any, error: Exception, results: asyncio.Queue) -> None:
+        if isinstance(item, tuple):
+            source, exam = item[:2]
+            logger.warning("Failed to process exam %s: %s", exam.name, error)
+            await results.put(ExamResult(source=source.name, exam=exam, error=str(error)))
+        else:
+            logger.warning("Failed to process source %s: %s", item.name, error)
+
+    async def _list(
+        self, source: ExamSource, outbox: asyncio.Queue, results: asyncio.Queue
+    ) -> None:
+        logger.info("Processing source: %s", source.name)
+        try:
+            async for exam in self.scraper.scrape_all(source.base_url):
+                await outbox.put((source, exam))
+        except Exception as e:
+            logger.warning("Failed to list source %s: %s", source.name, e)
+
+    async def _enrich(
+        self,
+        item: tuple[ExamSource, Exam],
+        outbox: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        source, exam = item
+        try:
+            await self.scraper.enrich_exam(exam)
+        except Exception as e:
+            await results.put(ExamResult(source=source.name, exam=exam, error=str(e)))
+            return
+
+        if exam.download.answer_key_url and self.parse_answer_keys:
+            await outbox.put(item)
+        else:
+            await results.put(ExamResult(source=source.name, exam=exam))
+
+    async def _fetch(
+        self,
+        item: tuple[ExamSource, Exam],
+        outbox: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        source, exam = item
+        try:
+            pdf = await self.extractor.download_pdf(exam.download.answer_key_url, pin=True)
+        except Exception as e:
+            await results.put(ExamResult(source=source.name, exam=exam, error=str(e)))
+            return
+        await outbox.put((source, exam, pdf))
+
+    async def _parse(
+        self,
+        item: tuple[ExamSource, Exam, StoredPdf],
+        outbox: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        source, exam, pdf = item
+        try:
+            answer_keys = await self.extractor.extract_answer_keys_stored(pdf)
+        except Exception as e:
+            await results.put(ExamResult(source=source.name, exam=exam, error=str(e)))
+            return
+        finally:
+            self.extractor.store.unpin(pdf.sha256)
+        await results.put(ExamResult(
+            source=source.name, exam=exam, answer_keys=answer_keys,
+            pdf_sha256=pdf.sha256, duplicate_of=self.extractor.duplicate_of(pdf.sha256)))
@@ -1,4 +1,16 @@
-from src.scrapers.base import BaseScraper
-from src.scrapers.pci_concursos import PciConcursosScraper
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseScraper", "PciConcursosScraper"]
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.scrapers.base import BaseScraper
+    from src.scrapers.html_backends import HtmlBackend, get_backend
+    from src.scrapers.pci_concursos import PciConcursosScraper
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.scrapers.base": ("BaseScraper",),
+    "src.scrapers.html_backends": ("HtmlBackend", "get_backend"),
+    "src.scrapers.pci_concursos": ("PciConcursosScraper",),
+})
+
+__all__ = ["BaseScraper", "PciConcursosScraper", "HtmlBackend", "get_backend"]
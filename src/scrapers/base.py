@@ -1,44 +1,127 @@
 from abc import ABC, abstractmethod
 import asyncio
+import time
 from collections.abc import AsyncIterator
 from typing import Optional
 
 import aiohttp
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 from src.config import settings
+from src.metrics.instruments import (
+    ENRICH,
+    ENRICH_SECONDS,
+    HTTP_CACHE,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_BYTES,
+    HTTP_RETRIES,
+)
 from src.models import Exam
+from src.services.adaptive import AdaptiveConcurrency
+from src.services.http_cache import HttpCache, get_default_cache
+from src.services.http_client import HttpClient, get_default_client, is_retryable
+from src.services.state_store import StateStore, get_default_state
+
+
+def log_retry(retry_state: RetryCallState) -> None:
+    args, kwargs = retry_state.args, retry_state.kwargs
+    url = args[1] if len(args) > 1 else kwargs.get("url", "unknown URL")
+    HTTP_RETRIES.inc(kind=args[2] if len(args) > 2 else kwargs.get("kind", "page"))
+    print(f"Retry {retry_state.attempt_number} for {url}")
 
 
 class BaseScraper(ABC):
     def __init__(
         self,
-        timeout: float = settings.timeout,
-        user_agent: str = settings.user_agent,
         max_concurrent: int = settings.max_concurrent_requests,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        client: Optional[HttpClient] = None,
+        cache: Optional[HttpCache] = None,
+        state: Optional[StateStore] = None,
+        incremental: bool = settings.incremental,
     ):
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self.user_agent = user_agent
         self.max_concurrent = max_concurrent
-        self._semaphore: Optional[asyncio.Semaphore] = None
+        if concurrency is None:
+            if settings.adaptive_concurrency:
+                concurrency = AdaptiveConcurrency(initial=max_concurrent)
+            else:
+                concurrency = AdaptiveConcurrency(
+                    initial=max_concurrent, min_limit=max_concurrent, max_limit=max_concurrent)
+        self.concurrency = concurrency
+        self.client = client or get_default_client()
+        self.cache = cache if cache is not None else get_default_cache()
+        self._state = state
+        self.incremental = incremental
+
+    @property
+    def state(self) -> StateStore:
+        if self._state is None:
+            self._state = get_default_state()
+        return self._state
 
     @retry(
         stop=stop_after_attempt(settings.retry_attempts),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((aiohttp.ClientError, TimeoutError)),
-        before_sleep=lambda retry_state: print(
-            f"Retry {retry_state.attempt_number} for {retry_state.args[1] if len(retry_state.args) > 1 else 'unknown URL'}"
-        ),
+        retry=retry_if_exception(is_retryable),
+        before_sleep=log_retry,
     )
-    async def fetch(self, session: aiohttp.ClientSession, url: str) -> str:
-        if self._semaphore is None:
-            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+    async def fetch(self, url: str, kind: str = "page") -> str:
+        entry = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            cached = await asyncio.to_thread(self.cache.read_text, entry)
+            if cached is not None:
+                HTTP_CACHE.inc(kind=kind, result="hit")
+                return cached
+
+        async with self.concurrency.slot():
+            headers = self.cache.conditional_headers(entry) if entry else None
+            await self.client.throttle(url)
+            started = time.monotonic()
+
+            try:
+                async with self.client.get(url, headers=headers, throttle=False) as response:
+                    self._record_response(response, time.monotonic() - started, kind)
+
+                    if response.status == 304 and entry:
+                        await asyncio.to_thread(self.cache.revalidate, entry, response.headers)
+                        cached = await asyncio.to_thread(self.cache.read_text, entry)
+                        if cached is None:
+                            raise aiohttp.ClientPayloadError(f"Cached body for {url} is missing")
+                        HTTP_CACHE.inc(kind=kind, result="revalidated")
+                        return cached
 
-        async with self._semaphore:
-            headers = {"User-Agent": self.user_agent}
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                return await response.text()
+                    if self.cache:
+                        HTTP_CACHE.inc(kind=kind, result="miss")
+                    return await self._read_text(response, url, kind)
+            except (aiohttp.ClientConnectionError, TimeoutError):
+                self.concurrency.record_failure()
+                raise
+
+    def _record_response(
+        self, response: aiohttp.ClientResponse, latency: float, kind: str = "page"
+    ) -> None:
+        HTTP_REQUESTS.inc(kind=kind, status=response.status)
+        HTTP_REQUEST_SECONDS.observe(latency, kind=kind)
+        self.concurrency.record_response(
+            response.status, latency, response.headers.get("Retry-After"))
+        if response.status in (429, 503):
+            response.raise_for_status()
+
+    async def _read_text(self, response: aiohttp.ClientResponse, url: str, kind: str) -> str:
+        response.raise_for_status()
+        body = await response.read()
+        HTTP_RESPONSE_BYTES.inc(len(body), kind=kind)
+        encoding = response.get_encoding()
+        if self.cache:
+            await asyncio.to_thread(self.cache.put, url, kind, body, response.headers, encoding)
+        return body.decode(encoding, errors="replace")
 
     @abstractmethod
     def parse_exam_list(self, html: str) -> list[Exam]:
@@ -48,16 +131,31 @@ class BaseScraper(ABC):
     def parse_download_page(self, html: str) -> tuple[Optional[str], Optional[str]]:
         pass
 
+    @abstractmethod
+    async def fetch_exam_list(self, base_url: str, page: int) -> list[Exam]:
+        pass
+
     @abstractmethod
     async def scrape_all(self, base_url: str) -> AsyncIterator[Exam]:
         pass
 
-    async def enrich_exam(self, session: aiohttp.ClientSession, exam: Exam) -> Exam:
-        try:
-            html = await self.fetch(session, exam.page_url)
-            exam_url, answer_key_url = self.parse_download_page(html)
-            exam.download.exam_url = exam_url
-            exam.download.answer_key_url = answer_key_url
-        except Exception as e:
-            print(f"Failed to enrich exam {exam.name}: {e}")
+    async def enrich_exam(self, exam: Exam) -> Exam:
+        if self.incremental:
+            known = self.state.get_download(exam.page_url)
+            if known:
+                exam.download = known
+                ENRICH.inc(result="known")
+                return exam
+
+        with ENRICH_SECONDS.time():
+            try:
+                html = await self.fetch(exam.page_url)
+                exam_url, answer_key_url = self.parse_download_page(html)
+                exam.download.exam_url = exam_url
+                exam.download.answer_key_url = answer_key_url
+                self.state.record_download(exam)
+                ENRICH.inc(result="ok")
+            except Exception:
+                ENRICH.inc(result="failed")
+                raise
         return exam
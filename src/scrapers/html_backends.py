@@ -0,0 +1,135 @@
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+_PDF_HREF_RE = re.compile(r"\.pdf$")
+
+
+@dataclass
+class ExamRow:
+    page_url: str
+    name: str
+    cols: list[str]
+
+
+class HtmlBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def exam_rows(self, html: str) -> list[ExamRow]:
+        pass
+
+    @abstractmethod
+    def pdf_links(self, html: str) -> list[str]:
+        pass
+
+
+class SoupBackend(HtmlBackend):
+    name = "bs4"
+
+    def __init__(self):
+        import bs4
+
+        self._bs4 = bs4
+
+    def _soup(self, html: str, parse_only: Optional["SoupStrainer"] = None) -> "BeautifulSoup":
+        return self._bs4.BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+    def exam_rows(self, html: str) -> list[ExamRow]:
+        rows = []
+        for row in self._soup(html, self._row_strainer()).select("tr.lk_link[data-url]"):
+            name_link = row.select_one("a.prova_download")
+            rows.append(
+                ExamRow(
+                    page_url=row["data-url"],
+                    name=name_link.get_text(strip=True) if name_link else "",
+                    cols=[col.get_text(strip=True) for col in row.find_all("td")],
+                )
+            )
+        return rows
+
+    def pdf_links(self, html: str) -> list[str]:
+        soup = self._soup(html, self._link_strainer())
+        return [link.get("href", "") for link in soup.select('a[href$=".pdf"]')]
+
+    def _row_strainer(self) -> Optional["SoupStrainer"]:
+        return None
+
+    def _link_strainer(self) -> Optional["SoupStrainer"]:
+        return None
+
+
+class StrainerBackend(SoupBackend):
+    name = "strainer"
+
+    def _row_strainer(self) -> "SoupStrainer":
+        return self._bs4.SoupStrainer("tr", attrs={"data-url": True})
+
+    def _link_strainer(self) -> "SoupStrainer":
+        return self._bs4.SoupStrainer("a", href=_PDF_HREF_RE)
+
+
+class LxmlBackend(HtmlBackend):
+    name = "lxml"
+
+    def __init__(self):
+        try:
+            from lxml import etree, html as lxml_html
+        except ImportError as e:
+            raise ImportError("The lxml HTML backend requires the 'lxml' package") from e
+
+        self._etree = etree
+        self._html = lxml_html
+        self._parser = lxml_html.HTMLParser(encoding="utf-8")
+
+    def _parse(self, html: str):
+        if not html.strip():
+            return None
+        return self._html.fromstring(html.encode("utf-8"), parser=self._parser)
+
+    def _text(self, element) -> str:
+        return "".join(part.strip() for part in element.itertext())
+
+    def exam_rows(self, html: str) -> list[ExamRow]:
+        root = self._parse(html)
+        if root is None:
+            return []
+
+        rows = []
+        for row in root.xpath(
+            "//tr[contains(concat(' ', normalize-space(@class), ' '), ' lk_link ') and @data-url]"
+        ):
+            name_links = row.xpath(
+                ".//a[contains(concat(' ', normalize-space(@class), ' '), ' prova_download ')]"
+            )
+            rows.append(
+                ExamRow(
+                    page_url=row.get("data-url"),
+                    name=self._text(name_links[0]) if name_links else "",
+                    cols=[self._text(col) for col in row.iter("td")],
+                )
+            )
+        return rows
+
+    def pdf_links(self, html: str) -> list[str]:
+        root = self._parse(html)
+        if root is None:
+            return []
+        return [link.get("href") for link in root.iter("a") if link.get("href", "").endswith(".pdf")]
+
+
+BACKENDS: dict[str, type[HtmlBackend]] = {
+    backend.name: backend for backend in (SoupBackend, StrainerBackend, LxmlBackend)
+}
+
+
+def get_backend(name: str) -> HtmlBackend:
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown HTML backend: {name}") from None
+    return backend()
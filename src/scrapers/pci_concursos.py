@@ -1,52 +1,46 @@
 import asyncio
+from collections import deque
 from collections.abc import AsyncIterator
 from typing import Optional
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 from src.config import settings
 from src.models import Exam
 from src.scrapers.base import BaseScraper
+from src.scrapers.html_backends import get_backend
 
 
 class PciConcursosScraper(BaseScraper):
+    def __init__(self, *args, html_backend: str = settings.html_backend, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.html_backend = get_backend(html_backend)
+
     def parse_exam_list(self, html: str) -> list[Exam]:
-        soup = BeautifulSoup(html, "html.parser")
         exams = []
 
-        for row in soup.select("tr.lk_link[data-url]"):
-            try:
-                cols = row.find_all("td")
-                if len(cols) < 5:
-                    continue
-
-                name_link = row.select_one("a.prova_download")
-                name = name_link.get_text(strip=True) if name_link else ""
-
-                exams.append(
-                    Exam(
-                        page_url=row["data-url"],
-                        name=name,
-                        year=cols[1].get_text(strip=True),
-                        organization=cols[2].get_text(strip=True),
-                        institution=cols[3].get_text(strip=True),
-                        level=cols[4].get_text(strip=True),
-                    )
-                )
-            except (KeyError, IndexError) as e:
-                print(f"Failed to parse row: {e}")
+        for row in self.html_backend.exam_rows(html):
+            if len(row.cols) < 5:
                 continue
 
+            exams.append(
+                Exam(
+                    page_url=row.page_url,
+                    name=row.name,
+                    year=row.cols[1],
+                    organization=row.cols[2],
+                    institution=row.cols[3],
+                    level=row.cols[4],
+                )
+            )
+
         return exams
 
     def parse_download_page(self, html: str) -> tuple[Optional[str], Optional[str]]:
-        soup = BeautifulSoup(html, "html.parser")
         exam_url = None
         answer_key_url = None
 
-        for link in soup.select('a[href$=".pdf"]'):
-            href = link.get("href", "")
+        for href in self.html_backend.pdf_links(html):
             if "gabarito" in href.lower():
                 if not answer_key_url:
                     answer_key_url = href
@@ -55,27 +49,58 @@ class PciConcursosScraper(BaseScraper):
 
         return exam_url, answer_key_url
 
-    async def scrape_all(self, base_url: str) -> AsyncIterator[Exam]:
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            page = 1
+    async def fetch_exam_list(self, base_url: str, page: int) -> list[Exam]:
+        url = base_url if page == 1 else f"{base_url}/{page}"
+        print(f"Fetching page {page}: {url}")
+        html = await self.fetch(url, kind="listing")
+        return self.parse_exam_list(html)
+
+    async def scrape_all(
+        self, base_url: str, window: Optional[int] = None
+    ) -> AsyncIterator[Exam]:
+        window = max(1, window or settings.listing_window)
+
+        loop = asyncio.get_running_loop()
+        pending: deque[tuple[int, asyncio.Task]] = deque()
+        next_page = 1
+        next_start = loop.time()
+        try:
             while True:
-                url = base_url if page == 1 else f"{base_url}/{page}"
-                print(f"Fetching page {page}: {url}")
-
+                while len(pending) < window:
+                    wait = next_start - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    next_start = loop.time() + settings.delay_between_requests
+                    task = asyncio.create_task(self.fetch_exam_list(base_url, next_page))
+                    pending.append((next_page, task))
+                    next_page += 1
+
+                page, task = pending.popleft()
                 try:
-                    html = await self.fetch(session, url)
-                    exams = self.parse_exam_list(html)
-
-                    if not exams:
+                    exams = await task
+                except aiohttp.ClientResponseError as e:
+                    if e.status == 404:
                         print(f"No more exams found at page {page}")
-                        break
-
-                    for exam in exams:
-                        yield exam
-
-                    page += 1
-                    await asyncio.sleep(settings.delay_between_requests)
-
+                    else:
+                        print(f"Failed to fetch page {page}: {e}")
+                    break
                 except Exception as e:
                     print(f"Failed to fetch page {page}: {e}")
                     break
+
+                if not exams:
+                    print(f"No more exams found at page {page}")
+                    break
+
+                if self.incremental:
+                    known = self.state.processed(exam.page_url for exam in exams)
+                    if all(exam.page_url in known for exam in exams):
+                        print(f"Page {page} has only known exams, stopping")
+                        break
+
+                for exam in exams:
+                    yield exam
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
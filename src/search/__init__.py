@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.search.index import QuestionIndex, SearchHit
+    from src.search.query import QuerySyntaxError, parse_query
+    from src.search.tokenizer import fold, tokenize
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.search.index": ("QuestionIndex", "SearchHit"),
+    "src.search.query": ("QuerySyntaxError", "parse_query"),
+    "src.search.tokenizer": ("fold", "tokenize"),
+})
+
+__all__ = [
+    "QuestionIndex",
+    "SearchHit",
+    "QuerySyntaxError",
+    "parse_query",
+    "fold",
+    "tokenize",
+]
@@ -0,0 +1,400 @@
+import bisect
+import heapq
+import json
+import math
+import shutil
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.config import settings
+from src.models import Exam
+from src.search.query import And, Node, Not, Or, Phrase, Term, parse_query
+from src.search.segment import Segment, SegmentWriter, StoredQuestion, merge_segments
+from src.search.tokenizer import fold
+from src.services.lru_index import write_atomic
+
+YearFilter = Union[int, tuple[int, int]]
+
+_CATEGORICAL = ("banca", "organization", "level")
+
+
+@dataclass
+class SearchHit:
+    page_url: str
+    exam_name: str
+    number: int
+    text: str
+    banca: str
+    year: int
+    organization: str
+    level: str
+    score: int
+
+
+class QuestionIndex:
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        max_segments: int = settings.search_max_segments,
+    ):
+        self.directory = Path(
+            directory or settings.search_index_dir or Path(settings.download_dir) / "search_index")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self._manifest_path = self.directory / "manifest.json"
+        if self._manifest_path.exists():
+            self._manifest = json.loads(self._manifest_path.read_text())
+        else:
+            self._manifest = {
+                "next_segment": 0,
+                "next_id": 0,
+                "segments": [],
+                "values": {name: [] for name in _CATEGORICAL},
+            }
+        self._codes = {
+            name: {fold(value).strip(): code for code, value in enumerate(values)}
+            for name, values in self._manifest["values"].items()
+        }
+        self._segments = [
+            Segment(self.directory / info["name"], info["base"], info["num_docs"])
+            for info in self._manifest["segments"]
+        ]
+        self._exams: dict[str, tuple[int, int]] = {}
+        self._deleted: set[int] = set()
+        self._dirty: set[str] = set()
+        self._load_sidecars()
+        self._writer = SegmentWriter()
+        self._deleted_local: dict[str, np.ndarray] = {}
+
+    def _load_sidecars(self) -> None:
+        exams = self._manifest.pop("exams", None)
+        deleted = self._manifest.pop("deleted", None)
+        if exams is not None:
+            # Manifests written before sidecar files held every exam and deletion.
+            self._exams = {page_url: tuple(span) for page_url, span in exams.items()}
+            self._deleted = set(deleted or ())
+            for segment, info in zip(self._segments, self._manifest["segments"]):
+                info.setdefault("deleted_gen", 0)
+                self._write_exams(segment)
+                self._dirty.add(segment.directory.name)
+            return
+
+        for segment, info in zip(self._segments, self._manifest["segments"]):
+            if info["deleted_gen"]:
+                local = np.load(segment.directory / f"deleted-{info['deleted_gen']}.npy")
+                self._deleted.update((local + segment.base).tolist())
+        for segment in self._segments:
+            spans = json.loads((segment.directory / "exams.json").read_text())
+            for page_url, (first, count) in spans.items():
+                if segment.base + first not in self._deleted:
+                    self._exams[page_url] = (segment.base + first, count)
+
+    def __len__(self) -> int:
+        return (sum(segment.num_docs for segment in self._segments)
+                + len(self._writer) - len(self._deleted))
+
+    def _code(self, name: str, value: str) -> int:
+        value = (value or "").strip()
+        key = fold(value)
+        codes = self._codes[name]
+        if key not in codes:
+            codes[key] = len(codes)
+            self._manifest["values"][name].append(value)
+        return codes[key]
+
+    def add_exam(self, exam: Exam, questions: Iterable[dict]) -> int:
+        self.remove_exam(exam.page_url)
+        fields = {
+            "banca": self._code("banca", exam.institution),
+            "organization": self._code("organization", exam.organization),
+            "level": self._code("level", exam.level),
+            "year": int(exam.year) if str(exam.year).isdigit() else 0,
+        }
+        base = self._manifest["next_id"]
+        first = None
+        count = 0
+        for question in questions:
+            doc = StoredQuestion(exam.page_url, exam.name, question["number"], question["text"])
+            local_id = self._writer.add(doc, fields)
+            first = base + local_id if first is None else first
+            count += 1
+        if count:
+            self._exams[exam.page_url] = (first, count)
+        return count
+
+    def remove_exam(self, page_url: str) -> None:
+        span = self._exams.pop(page_url, None)
+        if not span:
+            return
+        self._deleted.update(range(span[0], span[0] + span[1]))
+        segment = self._segment_of(span[0])
+        if segment is not None:
+            self._dirty.add(segment.directory.name)
+            self._deleted_local.pop(segment.directory.name, None)
+
+    def _segment_of(self, doc_id: int) -> Optional[Segment]:
+        index = bisect.bisect_right([segment.base for segment in self._segments], doc_id) - 1
+        if index >= 0 and doc_id < self._segments[index].base + self._segments[index].num_docs:
+            return self._segments[index]
+        return None
+
+    def commit(self) -> None:
+        if len(self._writer):
+            name = f"seg-{self._manifest['next_segment']:06d}"
+            self._writer.write(self.directory / name)
+            info = {"name": name, "base": self._manifest["next_id"],
+                    "num_docs": len(self._writer), "deleted_gen": 0}
+            segment = Segment(self.directory / name, info["base"], info["num_docs"])
+            self._write_exams(segment)
+            self._manifest["segments"].append(info)
+            self._manifest["next_segment"] += 1
+            self._manifest["next_id"] += len(self._writer)
+            self._segments.append(segment)
+            self._writer = SegmentWriter()
+            if len(self._deleted_in(segment)):
+                self._dirty.add(name)
+
+        stale = []
+        for segment, info in zip(self._segments, self._manifest["segments"]):
+            if segment.directory.name not in self._dirty:
+                continue
+            if info["deleted_gen"]:
+                stale.append(segment.directory / f"deleted-{info['deleted_gen']}.npy")
+            info["deleted_gen"] += 1
+            np.save(segment.directory / f"deleted-{info['deleted_gen']}.npy", self._deleted_in(segment))
+        self._dirty.clear()
+        self._write_manifest()
+        for path in stale:
+            path.unlink(missing_ok=True)
+
+        while merge := self._mergeable():
+            self._merge(merge)
+
+    def _write_manifest(self) -> None:
+        write_atomic(self._manifest_path, json.dumps(self._manifest).encode())
+
+    def _write_exams(self, segment: Segment) -> None:
+        end = segment.base + segment.num_docs
+        spans = {
+            page_url: [first - segment.base, count]
+            for page_url, (first, count) in self._exams.items()
+            if segment.base <= first < end
+        }
+        write_atomic(segment.directory / "exams.json", json.dumps(spans).encode())
+
+    def _mergeable(self) -> list[int]:
+        factor = max(2, self.max_segments)
+        tiers: dict[int, list[int]] = {}
+        for index, segment in enumerate(self._segments):
+            live = segment.num_docs - len(self._deleted_in(segment))
+            tiers.setdefault(int(math.log(max(live, 1), factor)), []).append(index)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= factor:
+                return tiers[tier]
+        return []
+
+    def merge(self) -> None:
+        self.commit()
+        if len(self._segments) > 1 or self._deleted:
+            self._merge(list(range(len(self._segments))))
+
+    def _merge(self, indexes: list[int]) -> None:
+        old_segments = [self._segments[index] for index in indexes]
+        name = f"seg-{self._manifest['next_segment']:06d}"
+        remaps = merge_segments(
+            old_segments, [self._live_mask(segment) for segment in old_segments], self.directory / name)
+        num_docs = sum(int((remap >= 0).sum()) for remap in remaps)
+        base = self._manifest["next_id"]
+
+        for segment, remap in zip(old_segments, remaps):
+            end = segment.base + segment.num_docs
+            for page_url, (first, count) in self._exams.items():
+                if segment.base <= first < end:
+                    self._exams[page_url] = (base + int(remap[first - segment.base]), count)
+            self._deleted = {doc_id for doc_id in self._deleted if not segment.base <= doc_id < end}
+
+        segment = Segment(self.directory / name, base, num_docs)
+        self._write_exams(segment)
+        merged = set(indexes)
+        self._manifest["segments"] = [
+            info for index, info in enumerate(self._manifest["segments"]) if index not in merged
+        ] + [{"name": name, "base": base, "num_docs": num_docs, "deleted_gen": 0}]
+        self._manifest["next_segment"] += 1
+        self._manifest["next_id"] += num_docs
+        self._write_manifest()
+
+        self._segments = [
+            segment for index, segment in enumerate(self._segments) if index not in merged
+        ] + [segment]
+        for old in old_segments:
+            self._deleted_local.pop(old.directory.name, None)
+            old.close()
+            shutil.rmtree(old.directory, ignore_errors=True)
+
+    def _live_mask(self, segment: Segment) -> np.ndarray:
+        mask = np.ones(segment.num_docs, dtype=bool)
+        deleted = self._deleted_in(segment)
+        mask[deleted] = False
+        return mask
+
+    def _deleted_in(self, segment: Segment) -> np.ndarray:
+        deleted = self._deleted_local.get(segment.directory.name)
+        if deleted is None:
+            end = segment.base + segment.num_docs
+            deleted = np.asarray(
+                sorted(doc_id - segment.base for doc_id in self._deleted
+                       if segment.base <= doc_id < end),
+                dtype=np.int32,
+            )
+            self._deleted_local[segment.directory.name] = deleted
+        return deleted
+
+    def _evaluate(self, node: Node, segment: Segment) -> np.ndarray:
+        if isinstance(node, Term):
+            return np.asarray(segment.docs(node.term))
+        if isinstance(node, Phrase):
+            return segment.phrase_docs(node.terms)
+        if isinstance(node, Or):
+            result = self._evaluate(node.children[0], segment)
+            for child in node.children[1:]:
+                result = np.union1d(result, self._evaluate(child, segment))
+            return result
+        if isinstance(node, Not):
+            return np.setdiff1d(
+                np.arange(segment.num_docs, dtype=np.int32),
+                self._evaluate(node.child, segment), assume_unique=True)
+
+        positives = [child for child in node.children if not isinstance(child, Not)]
+        negatives = [child.child for child in node.children if isinstance(child, Not)]
+        positives.sort(key=lambda child: self._estimate(child, segment))
+        result = (self._evaluate(positives[0], segment) if positives
+                  else np.arange(segment.num_docs, dtype=np.int32))
+        for child in positives[1:]:
+            if not len(result):
+                return result
+            if isinstance(child, Phrase):
+                result = segment.phrase_docs(child.terms, result)
+            else:
+                result = np.intersect1d(result, self._evaluate(child, segment), assume_unique=True)
+        for child in negatives:
+            result = np.setdiff1d(result, self._evaluate(child, segment), assume_unique=True)
+        return result
+
+    def _estimate(self, node: Node, segment: Segment) -> int:
+        if isinstance(node, Term):
+            return segment.lexicon.get(node.term, (0, 0))[1]
+        if isinstance(node, Phrase):
+            return min(segment.lexicon.get(term, (0, 0))[1] for term in node.terms)
+        return segment.num_docs
+
+    def _filter(self, segment: Segment, docs: np.ndarray, filters: dict) -> np.ndarray:
+        if not len(docs):
+            return docs
+        mask = np.ones(len(docs), dtype=bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            column = segment.fields[name][docs]
+            if name == "year":
+                low, high = value if isinstance(value, tuple) else (value, value)
+                mask &= (column >= low) & (column <= high)
+            else:
+                code = self._codes[name].get(fold(value).strip())
+                if code is None:
+                    return docs[:0]
+                mask &= column == code
+        docs = docs[mask]
+        deleted = self._deleted_in(segment)
+        if len(deleted):
+            docs = np.setdiff1d(docs, deleted, assume_unique=True)
+        return docs
+
+    def _score(self, node: Node, segment: Segment, docs: np.ndarray) -> np.ndarray:
+        scores = np.zeros(len(docs), dtype=np.int64)
+        for term in _positive_terms(node):
+            term_docs, frequencies = segment.term_frequencies(term)
+            indexes = np.searchsorted(term_docs, docs)
+            indexes[indexes >= len(term_docs)] = 0
+            found = term_docs[indexes] == docs if len(term_docs) else np.zeros(len(docs), dtype=bool)
+            scores[found] += frequencies[indexes[found]]
+        return scores
+
+    def _matches(self, query: str, filters: dict) -> Iterator[tuple[Node, Segment, np.ndarray]]:
+        node = parse_query(query)
+        for segment in self._segments:
+            docs = self._filter(segment, self._evaluate(node, segment), filters)
+            if len(docs):
+                yield node, segment, docs
+
+    def count(
+        self,
+        query: str,
+        banca: Optional[str] = None,
+        year: Optional[YearFilter] = None,
+        organization: Optional[str] = None,
+        level: Optional[str] = None,
+    ) -> int:
+        filters = {"banca": banca, "year": year, "organization": organization, "level": level}
+        return sum(len(docs) for _, _, docs in self._matches(query, filters))
+
+    def search(
+        self,
+        query: str,
+        banca: Optional[str] = None,
+        year: Optional[YearFilter] = None,
+        organization: Optional[str] = None,
+        level: Optional[str] = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        filters = {"banca": banca, "year": year, "organization": organization, "level": level}
+        candidates = []
+        for node, segment, docs in self._matches(query, filters):
+            scores = self._score(node, segment, docs)
+            if len(docs) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                docs, scores = docs[top], scores[top]
+            candidates.extend(
+                (int(score), -(segment.base + int(local_id)), segment, int(local_id))
+                for score, local_id in zip(scores, docs)
+            )
+
+        hits = []
+        for score, _, segment, local_id in heapq.nlargest(limit, candidates, key=lambda c: c[:2]):
+            doc = segment.stored(local_id)
+            values = self._manifest["values"]
+            hits.append(SearchHit(
+                page_url=doc.page_url,
+                exam_name=doc.exam_name,
+                number=doc.number,
+                text=doc.text,
+                banca=values["banca"][segment.fields["banca"][local_id]],
+                year=int(segment.fields["year"][local_id]),
+                organization=values["organization"][segment.fields["organization"][local_id]],
+                level=values["level"][segment.fields["level"][local_id]],
+                score=score,
+            ))
+        return hits
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+
+    def __enter__(self) -> "QuestionIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _positive_terms(node: Node) -> list[str]:
+    if isinstance(node, Term):
+        return [node.term]
+    if isinstance(node, Phrase):
+        return list(node.terms)
+    if isinstance(node, (And, Or)):
+        return [term for child in node.children for term in _positive_terms(child)]
+    return []
@@ -0,0 +1,109 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from src.search.tokenizer import tokenize
+
+_LEXER_RE = re.compile(r'"([^"]*)"|(\()|(\))|(-)(?=\S)|([^\s()"]+)')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Term:
+    term: str
+
+
+@dataclass(frozen=True)
+class Phrase:
+    terms: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class And:
+    children: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    child: "Node"
+
+
+Node = Union[Term, Phrase, And, Or, Not]
+
+
+def _words(text: str) -> Optional[Node]:
+    terms = tokenize(text)
+    if not terms:
+        return None
+    return Term(terms[0]) if len(terms) == 1 else Phrase(tuple(terms))
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.tokens = []
+        for phrase, lparen, rparen, minus, word in _LEXER_RE.findall(query):
+            if lparen or rparen or minus:
+                self.tokens.append(lparen or rparen or "NOT")
+            elif word in ("AND", "OR", "NOT"):
+                self.tokens.append(word)
+            else:
+                node = _words(phrase or word)
+                if node is not None:
+                    self.tokens.append(node)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()!r}")
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def parse_and(self) -> Node:
+        children = [self.parse_unary()]
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.take()
+            children.append(self.parse_unary())
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def parse_unary(self) -> Node:
+        token = self.take()
+        if token == "NOT":
+            return Not(self.parse_unary())
+        if token == "(":
+            node = self.parse_or()
+            if self.take() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            return node
+        if token is None or isinstance(token, str):
+            raise QuerySyntaxError(f"Unexpected {token!r}")
+        return token
+
+
+def parse_query(query: str) -> Node:
+    return _Parser(query).parse()
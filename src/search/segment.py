@@ -0,0 +1,227 @@
+import json
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.search.tokenizer import tokenize
+
+FIELDS = ("banca", "year", "organization", "level")
+
+
+@dataclass
+class StoredQuestion:
+    page_url: str
+    exam_name: str
+    number: int
+    text: str
+
+
+def _gather(array: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=array.dtype)
+    shifts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return array[shifts + np.arange(total)]
+
+
+def _write(
+    directory: Path,
+    lexicon: dict[str, tuple[int, int]],
+    doc_ids: np.ndarray,
+    pos_starts: np.ndarray,
+    positions: np.ndarray,
+    fields: dict[str, np.ndarray],
+    doc_lines: Sequence[bytes],
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "doc_ids.npy", doc_ids.astype(np.int32, copy=False))
+    np.save(directory / "pos_starts.npy", pos_starts.astype(np.int64, copy=False))
+    np.save(directory / "positions.npy", positions.astype(np.int32, copy=False))
+    for name in FIELDS:
+        np.save(directory / f"{name}.npy", fields[name].astype(np.int32, copy=False))
+    with open(directory / "lexicon.json", "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(",", ":"))
+
+    offsets = np.zeros(len(doc_lines) + 1, dtype=np.int64)
+    np.cumsum([len(line) for line in doc_lines], out=offsets[1:])
+    with open(directory / "docs.jsonl", "wb") as f:
+        f.writelines(doc_lines)
+    np.save(directory / "doc_offsets.npy", offsets)
+
+
+class SegmentWriter:
+    def __init__(self):
+        self._postings: defaultdict[str, list[tuple[int, list[int]]]] = defaultdict(list)
+        self._doc_lines: list[bytes] = []
+        self._fields: dict[str, list[int]] = {name: [] for name in FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._doc_lines)
+
+    def add(self, doc: StoredQuestion, fields: dict[str, int]) -> int:
+        local_id = len(self._doc_lines)
+        positions: defaultdict[str, list[int]] = defaultdict(list)
+        for position, term in enumerate(tokenize(doc.text)):
+            positions[term].append(position)
+        for term, term_positions in positions.items():
+            self._postings[term].append((local_id, term_positions))
+
+        self._doc_lines.append(json.dumps(
+            [doc.page_url, doc.exam_name, doc.number, doc.text], ensure_ascii=False
+        ).encode("utf-8") + b"\n")
+        for name in FIELDS:
+            self._fields[name].append(fields[name])
+        return local_id
+
+    def write(self, directory: Path) -> None:
+        lexicon: dict[str, tuple[int, int]] = {}
+        doc_ids: list[int] = []
+        lengths: list[int] = []
+        positions: list[int] = []
+
+        for term in sorted(self._postings):
+            postings = self._postings[term]
+            lexicon[term] = (len(doc_ids), len(postings))
+            for local_id, term_positions in postings:
+                doc_ids.append(local_id)
+                lengths.append(len(term_positions))
+                positions.extend(term_positions)
+
+        pos_starts = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=pos_starts[1:])
+        _write(
+            directory,
+            lexicon,
+            np.asarray(doc_ids, dtype=np.int32),
+            pos_starts,
+            np.asarray(positions, dtype=np.int32),
+            {name: np.asarray(values, dtype=np.int32) for name, values in self._fields.items()},
+            self._doc_lines,
+        )
+
+
+class Segment:
+    def __init__(self, directory: Path, base: int, num_docs: int):
+        self.directory = directory
+        self.base = base
+        self.num_docs = num_docs
+        self.doc_ids = np.load(directory / "doc_ids.npy", mmap_mode="r")
+        self.pos_starts = np.load(directory / "pos_starts.npy", mmap_mode="r")
+        self.positions = np.load(directory / "positions.npy", mmap_mode="r")
+        self.fields = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in FIELDS
+        }
+        self.doc_offsets = np.load(directory / "doc_offsets.npy", mmap_mode="r")
+        with open(directory / "lexicon.json", encoding="utf-8") as f:
+            self.lexicon: dict[str, tuple[int, int]] = {
+                term: (start, count) for term, (start, count) in json.load(f).items()
+            }
+        self._docs_file = open(directory / "docs.jsonl", "rb")
+
+    def postings(self, term: str) -> tuple[np.ndarray, int]:
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return np.empty(0, dtype=np.int32), 0
+        return self.doc_ids[entry[0]:entry[0] + entry[1]], entry[0]
+
+    def docs(self, term: str) -> np.ndarray:
+        return self.postings(term)[0]
+
+    def term_frequencies(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        doc_ids, start = self.postings(term)
+        return doc_ids, np.diff(self.pos_starts[start:start + len(doc_ids) + 1])
+
+    def _position_keys(self, term: str, docs: np.ndarray, offset: int) -> np.ndarray:
+        doc_ids, start = self.postings(term)
+        entries = start + np.searchsorted(doc_ids, docs)
+        starts = self.pos_starts[entries]
+        lengths = self.pos_starts[entries + 1] - starts
+        positions = _gather(self.positions, starts, lengths).astype(np.int64) - offset
+        owners = np.repeat(docs.astype(np.int64), lengths)
+        valid = positions >= 0
+        return (owners[valid] << 32) | positions[valid]
+
+    def phrase_docs(self, terms: tuple[str, ...], candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        docs = candidates
+        for term in terms:
+            term_docs = self.docs(term)
+            docs = term_docs if docs is None else np.intersect1d(docs, term_docs, assume_unique=True)
+            if not len(docs):
+                return np.asarray(docs, dtype=np.int32)
+
+        docs = np.asarray(docs)
+        keys = self._position_keys(terms[0], docs, 0)
+        for offset, term in enumerate(terms[1:], 1):
+            keys = np.intersect1d(keys, self._position_keys(term, docs, offset), assume_unique=True)
+            if not len(keys):
+                break
+        return np.unique(keys >> 32).astype(np.int32)
+
+    def doc_line(self, local_id: int) -> bytes:
+        self._docs_file.seek(int(self.doc_offsets[local_id]))
+        return self._docs_file.readline()
+
+    def stored(self, local_id: int) -> StoredQuestion:
+        page_url, exam_name, number, text = json.loads(self.doc_line(local_id))
+        return StoredQuestion(page_url, exam_name, number, text)
+
+    def close(self) -> None:
+        self._docs_file.close()
+
+
+def merge_segments(
+    segments: Sequence[Segment], live_masks: Sequence[np.ndarray], directory: Path
+) -> list[np.ndarray]:
+    remaps = []
+    num_docs = 0
+    for segment, live in zip(segments, live_masks):
+        remap = np.full(segment.num_docs, -1, dtype=np.int64)
+        remap[live] = num_docs + np.arange(int(live.sum()))
+        remaps.append(remap)
+        num_docs += int(live.sum())
+
+    lexicon: dict[str, tuple[int, int]] = {}
+    doc_ids, lengths, positions = [], [], []
+    entries = 0
+    for term in sorted(set().union(*(segment.lexicon for segment in segments))):
+        count = 0
+        for segment, remap in zip(segments, remaps):
+            entry = segment.lexicon.get(term)
+            if entry is None:
+                continue
+            start, n = entry
+            new_ids = remap[segment.doc_ids[start:start + n]]
+            keep = new_ids >= 0
+            starts = np.asarray(segment.pos_starts[start:start + n + 1])
+            term_lengths = np.diff(starts)[keep]
+            doc_ids.append(new_ids[keep])
+            lengths.append(term_lengths)
+            positions.append(_gather(segment.positions, starts[:-1][keep], term_lengths))
+            count += int(keep.sum())
+        if count:
+            lexicon[term] = (entries, count)
+            entries += count
+
+    all_lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+    pos_starts = np.zeros(len(all_lengths) + 1, dtype=np.int64)
+    np.cumsum(all_lengths, out=pos_starts[1:])
+    _write(
+        directory,
+        lexicon,
+        np.concatenate(doc_ids) if doc_ids else np.empty(0, dtype=np.int32),
+        pos_starts,
+        np.concatenate(positions) if positions else np.empty(0, dtype=np.int32),
+        {
+            name: np.concatenate([np.asarray(segment.fields[name])[live]
+                                  for segment, live in zip(segments, live_masks)])
+            for name in FIELDS
+        },
+        [segment.doc_line(int(local_id))
+         for segment, live in zip(segments, live_masks)
+         for local_id in np.flatnonzero(live)],
+    )
+    return remaps
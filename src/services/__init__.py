@@ -1,3 +1,51 @@
-from src.services.pdf_extractor import AnswerKey, PdfContent, PdfExtractor, PdfImage
+from typing import TYPE_CHECKING
 
-__all__ = ["PdfExtractor", "PdfContent", "PdfImage", "AnswerKey"]
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.models.answer_key import AnswerKey
+    from src.services.grading import GradeResult, grade
+    from src.services.http_cache import CacheEntry, HttpCache
+    from src.services.http_client import HostRateLimiter, HttpClient, TokenBucket
+    from src.services.near_duplicates import MinHasher, NearDuplicateIndex
+    from src.services.pdf_extractor import PdfContent, PdfExtractor, PdfPage
+    from src.services.pdf_images import PdfImage
+    from src.services.pdf_store import PdfStore, PdfTooLargeError, StoredPdf
+    from src.services.question_segmenter import QuestionSegmenter, QuestionSpan
+    from src.services.state_store import StateStore
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.models.answer_key": ("AnswerKey",),
+    "src.services.grading": ("GradeResult", "grade"),
+    "src.services.http_cache": ("CacheEntry", "HttpCache"),
+    "src.services.http_client": ("HostRateLimiter", "HttpClient", "TokenBucket"),
+    "src.services.near_duplicates": ("MinHasher", "NearDuplicateIndex"),
+    "src.services.pdf_extractor": ("PdfContent", "PdfExtractor", "PdfPage"),
+    "src.services.pdf_images": ("PdfImage",),
+    "src.services.pdf_store": ("PdfStore", "PdfTooLargeError", "StoredPdf"),
+    "src.services.question_segmenter": ("QuestionSegmenter", "QuestionSpan"),
+    "src.services.state_store": ("StateStore",),
+})
+
+__all__ = [
+    "PdfExtractor",
+    "PdfContent",
+    "PdfImage",
+    "PdfPage",
+    "QuestionSegmenter",
+    "QuestionSpan",
+    "AnswerKey",
+    "HttpCache",
+    "CacheEntry",
+    "HttpClient",
+    "HostRateLimiter",
+    "TokenBucket",
+    "PdfStore",
+    "StoredPdf",
+    "PdfTooLargeError",
+    "StateStore",
+    "NearDuplicateIndex",
+    "MinHasher",
+    "grade",
+    "GradeResult",
+]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from src.config import settings
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrency:
+    def __init__(
+        self,
+        initial: int = settings.max_concurrent_requests,
+        min_limit: int = settings.min_concurrent_requests,
+        max_limit: int = settings.adaptive_max_concurrent,
+        latency_factor: float = settings.adaptive_latency_factor,
+        smoothing: float = 0.1,
+        drift: float = 0.01,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_factor = latency_factor
+        self.smoothing = smoothing
+        self.drift = drift
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._successes = 0
+        self._baseline: Optional[float] = None
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        return self._baseline
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while True:
+                remaining = self._paused_until - time.monotonic()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=remaining)
+                    except TimeoutError:
+                        pass
+                    continue
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                await self._cond.wait()
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        if self._baseline is None:
+            self._baseline = latency
+        elif latency > self._baseline * self.latency_factor:
+            self._baseline += self.drift * (latency - self._baseline)
+            self._decrease()
+            return
+        else:
+            self._baseline += self.smoothing * (latency - self._baseline)
+
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self._limit = min(self.max_limit, self._limit + 1)
+
+    def record_response(self, status: int, latency: float, retry_after: Optional[str] = None) -> None:
+        if status in (429, 503):
+            self.record_throttle(parse_retry_after(retry_after))
+        elif status >= 500:
+            self.record_failure()
+        else:
+            self.record_success(latency)
+
+    def record_failure(self) -> None:
+        self._decrease()
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        self._decrease()
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def _decrease(self) -> None:
+        self._successes = 0
+        now = time.monotonic()
+        cooldown = self._baseline or 1.0
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit / 2)
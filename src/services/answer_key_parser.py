@@ -0,0 +1,142 @@
+import re
+from typing import Optional
+
+from src.models import AnswerKey
+from src.models.answer_key import VALID_ANSWERS
+
+_NOISE_RE = re.compile(
+    r"pcimarkpci\s*\S+"
+    r"|www\.pciconcursos\.com\.br"
+    r"|Página\s*\d+\s*de\s*\d+"
+)
+_BROKEN_WORD_RE = re.compile(r"([A-ZÀ-Ÿ])\n([A-ZÀ-Ÿ])")
+
+_CARGO_PATTERNS = [
+    (re.compile(
+        r"M(\d+)\s*[-–]\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)(?:\n|PROVA)",
+        re.IGNORECASE | re.MULTILINE), "m_pattern"),
+    (re.compile(
+        r"([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+(?:Militar|Bombeiro|Polícia|Civil|Perito|Tenente|Soldado|Oficial|Agente|Contador|Analista|Técnico|Escriturário|Assistente|Auxiliar|Administrador|Engenheiro|Advogado|Médico|Enfermeiro|Professor|Fiscal|Auditor|Delegado|Escrivão|Inspetor|Motorista|Operador|Secretário|Gestor|Coordenador|Supervisor|Gerente|Diretor)[A-Za-zÀ-ÿº\s\-–]*)[–\-]\s*Tipo\s*(\d+)",
+        re.IGNORECASE | re.MULTILINE), "tipo"),
+    (re.compile(
+        r"(?:GABARITO\s*(?:OFICIAL|DEFINITIVO|PRELIMINAR)?)\s*\n?\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)\s+Prova\s*[-–]?\s*([A-Z0-9]+)",
+        re.IGNORECASE | re.MULTILINE), "prova"),
+    (re.compile(
+        r"\n\s*([A-ZÀ-Ÿ][A-ZÀ-Ÿ\s\-–]+(?:ÁRIO|ISTA|OR|ENTE|IVO|ICO|IRO|ADO|IDO|OSO|ÃO|EIRO|ADOR)[A-ZÀ-Ÿ\s\-–]*)\s*\n\s*(?=\d+\s*[-–:]?\s*[A-E])",
+        re.IGNORECASE | re.MULTILINE), "uppercase"),
+]
+
+_NAME_PREFIX_RE = re.compile(
+    r"^(GABARITO\s*(DEFINITIVO|PRELIMINAR|OFICIAL)?\s*)", re.IGNORECASE)
+_NAME_ORDINAL_RE = re.compile(r"^\d*º?\s*")
+_WHITESPACE_RE = re.compile(r"\s+")
+_IGNORED_NAMES = frozenset(("PROVA", "GABARITO", "TIPO"))
+
+_EXAM_NAME_PATTERNS = [
+    re.compile(
+        r"(?:GABARITO\s*(?:OFICIAL|DEFINITIVO|PRELIMINAR)?)\s*\n?\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]{5,50})",
+        re.IGNORECASE),
+    re.compile(
+        r"([A-Z][A-Z\s\-–]+(?:ÁRIO|ISTA|OR|ENTE|IVO|ICO|IRO|ADO|IDO|OSO)[A-Z\s\-–]*)",
+        re.IGNORECASE),
+    re.compile(r"CARGO:\s*([A-Za-zÀ-ÿº\s\-–]+)", re.IGNORECASE),
+]
+
+_TABLE_RE = re.compile(
+    r"(\d+(?:\s+\d+){4,})\s*\n\s*([A-EX](?:\s+[A-EX]){4,})", re.IGNORECASE)
+_ANSWER_PATTERNS = [
+    re.compile(r"(\d{1,3})\s*[-–:]\s*([A-EX])", re.IGNORECASE),
+    re.compile(r"(\d{1,3})\s*[\.]\s*([A-EX])", re.IGNORECASE),
+    re.compile(r"\b(\d{1,3})\s+([A-EX])\b", re.IGNORECASE),
+]
+
+PARSER_VERSION = 2
+MIN_ANSWERS = 5
+MAX_QUESTION = 200
+
+
+class AnswerKeyParser:
+    def clean(self, text: str) -> str:
+        text = _NOISE_RE.sub("", text)
+        return _BROKEN_WORD_RE.sub(r"\1\2", text)
+
+    def parse(self, text: str) -> list[AnswerKey]:
+        text = self.clean(text)
+        answer_keys: dict[tuple[str, str], AnswerKey] = {}
+
+        for pattern, pattern_type in _CARGO_PATTERNS:
+            blocks = list(pattern.finditer(text))
+
+            for i, match in enumerate(blocks):
+                if pattern_type == "m_pattern":
+                    tipo = match.group(1).strip()
+                    exam_name = match.group(2).strip()
+                else:
+                    exam_name = match.group(1).strip()
+                    tipo = match.group(2).strip() if match.lastindex >= 2 else "1"
+
+                exam_name = self._clean_exam_name(exam_name)
+                if len(exam_name) < 4 or exam_name.upper() in _IGNORED_NAMES:
+                    continue
+
+                key = (exam_name, tipo)
+                if key in answer_keys:
+                    continue
+
+                end = blocks[i + 1].start() if i + 1 < len(blocks) else len(text)
+                answers = self.extract_answers(text, match.end(), end)
+
+                if len(answers) >= MIN_ANSWERS:
+                    answer_keys[key] = AnswerKey(exam_name=exam_name, tipo=tipo, answers=answers)
+
+            if answer_keys:
+                return list(answer_keys.values())
+
+        answers = self.extract_answers(text)
+        if len(answers) >= MIN_ANSWERS:
+            return [AnswerKey(exam_name=self.extract_exam_name(text), tipo="1", answers=answers)]
+        return []
+
+    def _clean_exam_name(self, exam_name: str) -> str:
+        exam_name = _NAME_PREFIX_RE.sub("", exam_name).strip()
+        exam_name = _NAME_ORDINAL_RE.sub("", exam_name).strip()
+        return _WHITESPACE_RE.sub(" ", exam_name).strip()
+
+    def extract_exam_name(self, text: str) -> str:
+        for pattern in _EXAM_NAME_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                name = _WHITESPACE_RE.sub(" ", match.group(1).strip())
+                if len(name) >= 5:
+                    return name
+        return "Unknown"
+
+    def has_answers(self, text: str) -> bool:
+        return len(self.extract_answers(text)) >= MIN_ANSWERS
+
+    def extract_answers(self, text: str, start: int = 0, end: Optional[int] = None) -> dict[int, str]:
+        if start or end is not None:
+            text = text[start:end]
+        answers: dict[int, str] = {}
+
+        for match in _TABLE_RE.finditer(text):
+            nums = match.group(1).split()
+            letters = match.group(2).upper().split()
+            for num_str, letter in zip(nums, letters):
+                num = int(num_str)
+                if 1 <= num <= MAX_QUESTION and letter in VALID_ANSWERS:
+                    answers[num] = letter
+
+        if answers:
+            return answers
+
+        for pattern in _ANSWER_PATTERNS:
+            for match in pattern.finditer(text):
+                num = int(match.group(1))
+                if 1 <= num <= MAX_QUESTION and num not in answers:
+                    answers[num] = match.group(2).upper()
+
+        return answers
+
+
+answer_key_parser = AnswerKeyParser()
@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Optional
+
+from src.config import settings
+from src.services.lru_index import LruIndex, write_atomic
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+_TYPES: dict[str, type] = {}
+
+
+def register_types(*types: type) -> None:
+    for cls in types:
+        _TYPES[cls.__name__] = cls
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and "__type__" not in value:
+            return {key: _encode(item) for key, item in value.items()}
+        items = [[_encode(key), _encode(item)] for key, item in value.items()]
+        return {"__type__": "dict", "items": items}
+    if isinstance(value, bytes):
+        return {"__type__": "bytes", "data": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, Path):
+        return {"__type__": "path", "path": str(value)}
+    name = type(value).__name__
+    if _TYPES.get(name) is not type(value):
+        raise TypeError(f"Cannot cache values of type {name}")
+    state = value.__getstate__() if hasattr(value, "__getstate__") else vars(value)
+    return {"__type__": name, "state": _encode(state)}
+
+
+def _decode(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_decode(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    kind = data.get("__type__")
+    if kind is None:
+        return {key: _decode(item) for key, item in data.items()}
+    if kind == "dict":
+        return {_decode(key): _decode(item) for key, item in data["items"]}
+    if kind == "bytes":
+        return base64.b64decode(data["data"])
+    if kind == "path":
+        return Path(data["path"])
+
+    cls = _TYPES[kind]
+    value = cls.__new__(cls)
+    state = _decode(data["state"])
+    if hasattr(cls, "__setstate__"):
+        value.__setstate__(state)
+    else:
+        value.__dict__.update(state)
+    return value
+
+
+class ExtractionCache:
+    def __init__(
+        self,
+        versions: Mapping[str, str],
+        directory: Optional[str | Path] = None,
+        max_bytes: int = settings.extraction_cache_max_mb * 1024 * 1024,
+    ):
+        self.directory = Path(
+            directory or settings.extraction_cache_dir
+            or Path(settings.download_dir) / "extraction_cache")
+        self.versions = {component: _digest(version) for component, version in versions.items()}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lru = LruIndex(max_bytes, self._remove)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            if len(path.stem.split("-")) != 4:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        self._lru.load(entries)
+
+    def key(self, sha256: str, component: str, options: Optional[Mapping[str, Any]] = None) -> str:
+        encoded_options = json.dumps(options or {}, sort_keys=True, default=list)
+        return f"{sha256}-{component}-{self.versions[component]}-{_digest(encoded_options)}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            value = _decode(json.loads(path.read_bytes()))
+        except FileNotFoundError:
+            return default
+        except Exception:
+            self._lru.discard(key)
+            path.unlink(missing_ok=True)
+            return default
+        self._lru.touch(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(_encode(value), ensure_ascii=False).encode("utf-8")
+        write_atomic(self._path(key), data)
+        self._lru.track(key, len(data))
+
+    def _remove(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
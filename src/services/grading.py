@@ -0,0 +1,69 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+from src.models import AnswerKey
+from src.models.answer_key import ANNULLED, BLANK
+
+Sheets = Union[np.ndarray, Sequence[str], Sequence[bytes]]
+
+_BLANK_CODE = ord(BLANK)
+_ANNULLED_CODE = ord(ANNULLED)
+
+
+@dataclass
+class GradeResult:
+    scores: np.ndarray
+    max_score: float
+    correct: Optional[np.ndarray] = None
+
+
+def encode_sheets(sheets: Sheets, num_questions: int) -> np.ndarray:
+    if isinstance(sheets, np.ndarray):
+        matrix = np.asarray(sheets, dtype=np.uint8)
+        if matrix.ndim != 2:
+            raise ValueError("Answer sheets must be a 2-D (sheets x questions) array")
+        if matrix.shape[1] < num_questions:
+            padding = np.full((matrix.shape[0], num_questions - matrix.shape[1]), _BLANK_CODE, np.uint8)
+            matrix = np.hstack([matrix, padding])
+        return matrix[:, :num_questions]
+
+    blank = BLANK.encode("ascii")
+    rows = []
+    for sheet in sheets:
+        row = sheet.upper() if isinstance(sheet, bytes) else sheet.upper().encode("ascii", "replace")
+        rows.append(row[:num_questions].ljust(num_questions, blank))
+    return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), num_questions)
+
+
+def grade(
+    key: AnswerKey,
+    sheets: Sheets,
+    weights: Optional[Sequence[float]] = None,
+    return_matrix: bool = False,
+) -> GradeResult:
+    key_codes = key.as_array()
+    matrix = encode_sheets(sheets, len(key_codes))
+
+    scored = key_codes != _BLANK_CODE
+    annulled = key_codes == _ANNULLED_CODE
+    correct = ((matrix == key_codes) | annulled) & scored
+
+    if weights is None:
+        scores = correct.sum(axis=1, dtype=np.int32)
+        max_score = float(scored.sum())
+    else:
+        weight_array = np.asarray(weights, dtype=np.float64)
+        if weight_array.shape != key_codes.shape:
+            raise ValueError(
+                f"Expected {len(key_codes)} weights, got {weight_array.shape[0]}")
+        scores = correct @ weight_array
+        max_score = float(weight_array[scored].sum())
+
+    return GradeResult(
+        scores=scores,
+        max_score=max_score,
+        correct=correct if return_matrix else None,
+    )
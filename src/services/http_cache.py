@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+from src.services.lru_index import LruIndex, write_atomic
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    kind: str
+    stored_at: float
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    encoding: Optional[str] = None
+    sha256: Optional[str] = None
+
+
+_ENTRY_FIELDS = tuple(field.name for field in fields(CacheEntry))
+
+
+class HttpCache:
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        max_bytes: int = settings.http_cache_max_mb * 1024 * 1024,
+        ttls: Optional[Mapping[str, float]] = None,
+    ):
+        self.directory = Path(directory or Path(settings.download_dir) / "http_cache")
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls) if ttls is not None else {
+            "listing": settings.http_cache_ttl_listing,
+            "page": settings.http_cache_ttl_page,
+            "pdf": settings.http_cache_ttl_pdf,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lru = LruIndex(max_bytes, self._remove)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        metas = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                mtime = meta_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            try:
+                size = meta_path.with_suffix(".body").stat().st_size
+            except FileNotFoundError:
+                size = 0
+            metas.append((mtime, meta_path.stem, size))
+        self._lru.load(metas)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        meta_path, _ = self._paths(self._key(url))
+        try:
+            data = json.loads(meta_path.read_text())
+            return CacheEntry(**{name: data[name] for name in _ENTRY_FIELDS if name in data})
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttls.get(entry.kind, 0.0)
+
+    def conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry: CacheEntry) -> Optional[bytes]:
+        key = self._key(entry.url)
+        meta_path, body_path = self._paths(key)
+        try:
+            body = body_path.read_bytes()
+        except FileNotFoundError:
+            meta_path.unlink(missing_ok=True)
+            return None
+        self._touch(key, meta_path)
+        return body
+
+    def read_text(self, entry: CacheEntry) -> Optional[str]:
+        body = self.read(entry)
+        if body is None:
+            return None
+        return body.decode(entry.encoding or "utf-8", errors="replace")
+
+    def put(
+        self,
+        url: str,
+        kind: str,
+        body: bytes,
+        headers: Mapping[str, str],
+        encoding: Optional[str] = None,
+    ) -> CacheEntry:
+        key = self._key(url)
+        meta_path, body_path = self._paths(key)
+        entry = CacheEntry(
+            url=url,
+            kind=kind,
+            stored_at=time.time(),
+            size=len(body),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            encoding=encoding,
+        )
+
+        write_atomic(body_path, body)
+        write_atomic(meta_path, json.dumps(asdict(entry)).encode())
+        self._lru.track(key, entry.size)
+        return entry
+
+    def put_ref(
+        self, url: str, kind: str, sha256: str, headers: Mapping[str, str]
+    ) -> CacheEntry:
+        key = self._key(url)
+        meta_path, body_path = self._paths(key)
+        entry = CacheEntry(
+            url=url,
+            kind=kind,
+            stored_at=time.time(),
+            size=0,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            sha256=sha256,
+        )
+
+        body_path.unlink(missing_ok=True)
+        write_atomic(meta_path, json.dumps(asdict(entry)).encode())
+        self._lru.track(key, entry.size)
+        return entry
+
+    def revalidate(self, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        entry.stored_at = time.time()
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+        meta_path, _ = self._paths(self._key(entry.url))
+        write_atomic(meta_path, json.dumps(asdict(entry)).encode())
+        return entry
+
+    def touch(self, entry: CacheEntry) -> None:
+        key = self._key(entry.url)
+        self._touch(key, self._paths(key)[0])
+
+    def _touch(self, key: str, meta_path: Path) -> None:
+        self._lru.touch(key)
+        try:
+            os.utime(meta_path)
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def get_default_cache() -> Optional[HttpCache]:
+    global _default_cache
+    if not settings.http_cache_enabled:
+        return None
+    if _default_cache is None:
+        _default_cache = HttpCache()
+    return _default_cache
@@ -0,0 +1,132 @@
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.config import settings
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status not in (404, 410)
+    return isinstance(exc, (aiohttp.ClientError, TimeoutError))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(
+                        self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        rate: float = settings.requests_per_second,
+        burst: int = settings.request_burst,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        if self.rate <= 0:
+            return
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, max(1, self.burst))
+        await bucket.acquire()
+
+
+class HttpClient:
+    def __init__(
+        self,
+        timeout: float = settings.timeout,
+        user_agent: str = settings.user_agent,
+        limit: int = settings.connection_limit,
+        limit_per_host: int = settings.connection_limit_per_host,
+        dns_cache_ttl: int = settings.dns_cache_ttl,
+        keepalive_timeout: float = settings.keepalive_timeout,
+        limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.user_agent = user_agent
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.limiter = limiter or HostRateLimiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._session
+
+    async def throttle(self, url: str) -> None:
+        await self.limiter.acquire(url)
+
+    @asynccontextmanager
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        throttle: bool = True,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        if throttle:
+            await self.throttle(url)
+        async with self.session.get(url, headers=headers) as response:
+            yield response
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "HttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+_default_client: Optional[HttpClient] = None
+
+
+def get_default_client() -> HttpClient:
+    global _default_client
+    if _default_client is None:
+        _default_client = HttpClient()
+    return _default_client
@@ -0,0 +1,70 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class LruIndex:
+    def __init__(
+        self,
+        max_bytes: int,
+        evict: Callable[[str], None],
+        pinned: Optional[Callable[[str], bool]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._evict_key = evict
+        self._pinned = pinned or (lambda key: False)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+    def load(self, entries: Iterable[tuple[float, str, int]]) -> None:
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self.size -= self._entries.pop(key, 0)
+                self._entries[key] = size
+                self.size += size
+        self.evict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def track(self, key: str, size: int) -> None:
+        with self._lock:
+            self.size -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self.size += size
+        self.evict()
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self.size -= self._entries.pop(key, 0)
+
+    def evict(self) -> None:
+        while True:
+            with self._lock:
+                if self.size <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                candidates = islice(self._entries, len(self._entries) - 1)
+                key = next((key for key in candidates if not self._pinned(key)), None)
+                if key is None:
+                    return
+                self.size -= self._entries.pop(key)
+            self._evict_key(key)
@@ -0,0 +1,177 @@
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.config import settings
+from src.models import AnswerKey
+
+_PRIME = np.uint64(4294967311)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    sha256 TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    canonical TEXT,
+    PRIMARY KEY (sha256, kind)
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_lookup ON lsh_buckets (kind, band, bucket);
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    canonical TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_digest ON documents (digest);
+"""
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = settings.minhash_permutations, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> Optional[np.ndarray]:
+        hashes = np.unique(np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64))
+        if not len(hashes):
+            return None
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def answers_signature(self, answer_keys: Iterable[AnswerKey], size: int = 8) -> Optional[np.ndarray]:
+        answers = "|".join(sorted(key.answer_string() for key in answer_keys))
+        if len(answers) < size:
+            return None
+        return self.signature(answers[i:i + size] for i in range(len(answers) - size + 1))
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        hasher: Optional[MinHasher] = None,
+        bands: int = settings.lsh_bands,
+        threshold: float = settings.near_duplicate_threshold,
+    ):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("bands must divide the number of permutations")
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self.threshold = threshold
+        self.path = Path(
+            path or settings.near_duplicates_path
+            or Path(settings.download_dir) / "near_duplicates.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _buckets(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        return [
+            (band, int.from_bytes(hashlib.blake2b(
+                signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8,
+            ).digest(), "little", signed=True))
+            for band in range(self.bands)
+        ]
+
+    def find(self, kind: str, signature: np.ndarray, exclude: Optional[str] = None) -> Optional[tuple[str, float]]:
+        buckets = self._buckets(signature)
+        placeholders = ",".join("(?, ?)" for _ in buckets)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT s.sha256, s.signature, s.canonical FROM signatures s
+                WHERE s.kind = ? AND s.sha256 IN (
+                    SELECT sha256 FROM lsh_buckets
+                    WHERE kind = ? AND (band, bucket) IN (VALUES {placeholders})
+                )
+                """,
+                [kind, kind, *(value for bucket in buckets for value in bucket)],
+            ).fetchall()
+
+        best = None
+        for sha256, blob, canonical in rows:
+            if sha256 == exclude:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (canonical or sha256, score)
+        return best
+
+    def add(self, kind: str, sha256: str, signature: np.ndarray, canonical: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO signatures (sha256, kind, signature, canonical)
+                VALUES (?, ?, ?, ?)
+                """,
+                (sha256, kind, signature.astype(np.uint64).tobytes(), canonical),
+            ).rowcount
+            if inserted:
+                self._conn.executemany(
+                    "INSERT INTO lsh_buckets (kind, band, bucket, sha256) VALUES (?, ?, ?, ?)",
+                    [(kind, band, bucket, sha256) for band, bucket in self._buckets(signature)],
+                )
+
+    def find_document(self, digest: str, exclude: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(canonical, sha256) FROM documents WHERE digest = ? AND sha256 != ? LIMIT 1",
+                (digest, exclude or ""),
+            ).fetchone()
+        return row[0] if row else None
+
+    def add_document(self, sha256: str, digest: str, canonical: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO documents (sha256, digest, canonical) VALUES (?, ?, ?)",
+                (sha256, digest, canonical),
+            )
+
+    def canonical(self, sha256: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT canonical FROM documents WHERE sha256 = ? AND canonical IS NOT NULL
+                UNION ALL
+                SELECT canonical FROM signatures WHERE sha256 = ? AND canonical IS NOT NULL
+                LIMIT 1
+                """,
+                (sha256, sha256),
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_default_index: Optional[NearDuplicateIndex] = None
+
+
+def get_default_near_duplicates() -> Optional[NearDuplicateIndex]:
+    global _default_index
+    if not settings.near_duplicates_enabled:
+        return None
+    if _default_index is None:
+        _default_index = NearDuplicateIndex()
+    return _default_index
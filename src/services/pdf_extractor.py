@@ -1,27 +1,68 @@
+import asyncio
+import hashlib
 import io
-import re
+import mmap
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
 
-import aiohttp
-from PIL import Image
+import pypdf
 from pypdf import PdfReader
+from pypdf.generic import ArrayObject, IndirectObject, StreamObject
+
+from src.config import settings
+from src.metrics.instruments import (
+    ANSWER_KEY_PARSE_SECONDS,
+    ANSWER_KEYS,
+    ANSWERS_PER_PDF,
+    EXTRACTION_CACHE,
+    HTTP_CACHE,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_BYTES,
+    HTTP_RETRIES,
+    NEAR_DUPLICATES,
+    PDF_EXTRACT_SECONDS,
+    PDF_PAGE_SECONDS,
+    PDF_PAGES,
+)
+from src.metrics.registry import MetricsDelta, metrics
+from src.services.answer_key_parser import PARSER_VERSION, AnswerKey, answer_key_parser
+from src.services.extraction_cache import ExtractionCache, register_types
+from src.services.http_cache import HttpCache, get_default_cache
+from src.services.pdf_images import IMAGE_MODES, ImageCollector, PdfImage, image_payload, merge_images
+from src.services.pdf_store import PdfStore, StoredPdf, get_default_store
+from src.services.question_segmenter import QuestionSegmenter, QuestionSpan
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.services.adaptive import AdaptiveConcurrency
+    from src.services.http_client import HttpClient
+    from src.services.near_duplicates import NearDuplicateIndex
+
+PdfSource = Union[bytes, str, Path, StoredPdf]
+
+EARLY_EXIT_PAGES = 2
+
+TEXT_VERSION = f"1/pypdf-{pypdf.__version__}"
+EXTRACTOR_VERSIONS = {
+    "text": TEXT_VERSION,
+    "answer_keys": f"{PARSER_VERSION}/{TEXT_VERSION}",
+    "questions": f"1/{TEXT_VERSION}",
+}
 
 
 @dataclass
-class PdfImage:
-    page: int
-    index: int
-    width: int
-    height: int
-    data: bytes
-    format: str
-
-
-@dataclass
-class AnswerKey:
-    exam_name: str
-    tipo: str
-    answers: dict[int, str]
+class PdfPage:
+    number: int
+    text: str
+    images: list[PdfImage] = field(default_factory=list)
 
 
 @dataclass
@@ -32,41 +73,329 @@ class PdfContent:
     images: list[PdfImage] = field(default_factory=list)
 
 
+register_types(PdfContent, PdfImage, AnswerKey)
+
+
 class PdfExtractor:
-    def __init__(self, user_agent: str = "Mozilla/5.0"):
-        self.user_agent = user_agent
+    def __init__(
+        self,
+        executor: str = settings.pdf_executor,
+        max_workers: Optional[int] = settings.pdf_workers,
+        max_queued: int = settings.pdf_max_queued,
+        client: Optional["HttpClient"] = None,
+        cache: Optional[HttpCache] = None,
+        store: Optional[PdfStore] = None,
+        results_cache: Optional[ExtractionCache] = None,
+        near_duplicates: Optional["NearDuplicateIndex"] = None,
+        max_memoized: int = 1024,
+        image_mode: str = settings.pdf_image_mode,
+        image_dir: Optional[str | Path] = None,
+        pages_per_job: int = settings.pdf_pages_per_job,
+        concurrency: Optional["AdaptiveConcurrency"] = None,
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown PDF executor: {executor}")
+        if image_mode not in IMAGE_MODES:
+            raise ValueError(f"Unknown PDF image mode: {image_mode}")
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._client = client
+        self._cache = cache
+        self._store = store
+        self._results_cache = results_cache
+        self._near_duplicates = near_duplicates
+        self.max_memoized = max_memoized
+        self.image_mode = image_mode
+        self.image_dir = Path(image_dir or settings.pdf_image_dir or Path(settings.download_dir) / "images")
+        self.pages_per_job = pages_per_job
+        self.concurrency = concurrency
+        self._answer_key_tasks: OrderedDict[str, asyncio.Future] = OrderedDict()
+        self._executor: Optional[Executor] = None
+        self._queue_slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> "HttpClient":
+        if self._client is None:
+            from src.services.http_client import get_default_client
+
+            self._client = get_default_client()
+        return self._client
+
+    @property
+    def cache(self) -> Optional[HttpCache]:
+        if self._cache is None:
+            self._cache = get_default_cache()
+        return self._cache
+
+    @property
+    def store(self) -> PdfStore:
+        if self._store is None:
+            self._store = get_default_store()
+        return self._store
+
+    @property
+    def results_cache(self) -> Optional[ExtractionCache]:
+        if self._results_cache is None:
+            self._results_cache = get_default_results_cache()
+        return self._results_cache
+
+    @property
+    def near_duplicates(self) -> Optional["NearDuplicateIndex"]:
+        if self._near_duplicates is None:
+            from src.services.near_duplicates import get_default_near_duplicates
+
+            self._near_duplicates = get_default_near_duplicates()
+        return self._near_duplicates
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=metrics.drain)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run_in_executor(self, func, *args):
+        if self._queue_slots is None:
+            self._queue_slots = asyncio.Semaphore(self.max_queued)
+
+        async with self._queue_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def _run_job(self, func, *args):
+        result, delta = await self._run_in_executor(func, *args, self.executor == "process")
+        metrics.merge(delta)
+        return result
+
+    def _lookup(self, component: str, source: PdfSource, options: dict) -> tuple[str, object]:
+        key = self.results_cache.key(_source_sha256(source), component, options)
+        result = self.results_cache.get(key)
+        EXTRACTION_CACHE.inc(component=component, result="miss" if result is None else "hit")
+        return key, result
+
+    def _memoized(self, component: str, source: PdfSource, options: dict, compute):
+        if self.results_cache is None:
+            return compute()
+        key, result = self._lookup(component, source, options)
+        if result is None:
+            result = compute()
+            self.results_cache.put(key, result)
+        return result
+
+    async def _memoized_async(self, component: str, source: PdfSource, options: dict, compute):
+        if self.results_cache is None:
+            return await compute()
+        key, result = await asyncio.to_thread(self._lookup, component, source, options)
+        if result is None:
+            result = await compute()
+            await asyncio.to_thread(self.results_cache.put, key, result)
+        return result
+
+    async def _memoized_job(self, component: str, source: PdfSource, options: dict, func, *args):
+        return await self._memoized_async(component, source, options, lambda: self._run_job(func, *args))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def download_pdf(self, url: str, pin: bool = False) -> StoredPdf:
+        from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+        from src.services.http_client import is_retryable
+
+        def log_retry(retry_state) -> None:
+            HTTP_RETRIES.inc(kind="pdf")
+            print(f"Retry {retry_state.attempt_number} for {url}")
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(settings.retry_attempts),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=log_retry,
+            reraise=True,
+        ):
+            with attempt:
+                stored = await self._download_pdf_once(url)
+                return await self._pin(stored) if pin else stored
+
+    async def _pin(self, stored: StoredPdf) -> StoredPdf:
+        self.store.pin(stored.sha256)
+        try:
+            if await asyncio.to_thread(stored.path.exists):
+                return stored
+        except BaseException:
+            self.store.unpin(stored.sha256)
+            raise
+        self.store.unpin(stored.sha256)
+        import aiohttp
+
+        raise aiohttp.ClientPayloadError(f"Stored PDF {stored.sha256} was evicted")
+
+    async def _download_pdf_once(self, url: str) -> StoredPdf:
+        cache = self.cache
+        entry = await asyncio.to_thread(cache.get, url) if cache else None
+        stored = None
+        if entry and entry.sha256:
+            stored = await asyncio.to_thread(self.store.get, entry.sha256)
+        if stored and cache.is_fresh(entry):
+            await asyncio.to_thread(cache.touch, entry)
+            HTTP_CACHE.inc(kind="pdf", result="hit")
+            return stored
+
+        if self.concurrency is None:
+            return await self._request_pdf(url, entry, stored)
+        import aiohttp
+
+        async with self.concurrency.slot():
+            try:
+                return await self._request_pdf(url, entry, stored)
+            except (aiohttp.ClientConnectionError, TimeoutError):
+                self.concurrency.record_failure()
+                raise
+
+    async def _request_pdf(self, url: str, entry, stored: Optional[StoredPdf]) -> StoredPdf:
+        cache = self.cache
+        headers = cache.conditional_headers(entry) if stored else None
+
+        await self.client.throttle(url)
+        started = time.perf_counter()
+
+        async with self.client.get(url, headers=headers, throttle=False) as response:
+            latency = time.perf_counter() - started
+            HTTP_REQUESTS.inc(kind="pdf", status=response.status)
+            HTTP_REQUEST_SECONDS.observe(latency, kind="pdf")
+            if self.concurrency is not None:
+                self.concurrency.record_response(
+                    response.status, latency, response.headers.get("Retry-After"))
+            if response.status == 304 and stored:
+                await asyncio.to_thread(cache.revalidate, entry, response.headers)
+                HTTP_CACHE.inc(kind="pdf", result="revalidated")
+                return stored
 
-    async def fetch_pdf(self, session: aiohttp.ClientSession, url: str) -> bytes:
-        headers = {"User-Agent": self.user_agent}
-        async with session.get(url, headers=headers) as response:
             response.raise_for_status()
-            return await response.read()
+            stored = await self.store.save_response(response)
+            HTTP_RESPONSE_BYTES.inc(stored.size, kind="pdf")
+            if cache:
+                await asyncio.to_thread(cache.put_ref, url, "pdf", stored.sha256, response.headers)
+                HTTP_CACHE.inc(kind="pdf", result="miss")
+            return stored
+
+    async def fetch_pdf(self, url: str) -> bytes:
+        stored = await self.download_pdf(url)
+        return await asyncio.to_thread(stored.path.read_bytes)
+
+    @contextmanager
+    def _open_reader(self, source: PdfSource) -> Iterator[PdfReader]:
+        if isinstance(source, StoredPdf):
+            source = source.path
+        if isinstance(source, (bytes, bytearray)):
+            yield PdfReader(io.BytesIO(source))
+            return
+
+        with open(source, "rb") as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                yield PdfReader(io.BytesIO(b""))
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield PdfReader(mapped)
+
+    def iter_pages(
+        self,
+        source: PdfSource,
+        pages: Optional[Iterable[int]] = None,
+        extract_images: bool = False,
+    ) -> Iterator[PdfPage]:
+        with self._open_reader(source) as reader:
+            yield from self._iter_pages(reader, pages, extract_images)
+
+    def _iter_pages(
+        self, reader: PdfReader, pages: Optional[Iterable[int]], extract_images: bool
+    ) -> Iterator[PdfPage]:
+        num_pages = len(reader.pages)
+        numbers = range(1, num_pages + 1) if pages is None else pages
+        collector = None
+        if extract_images and self.image_mode != "decode":
+            collector = ImageCollector(self.image_mode, self.image_dir)
+
+        for number in numbers:
+            if not 1 <= number <= num_pages:
+                continue
+            started = time.perf_counter()
+            page = reader.pages[number - 1]
+            text = page.extract_text() or ""
+            PDF_PAGE_SECONDS.observe(time.perf_counter() - started)
+            PDF_PAGES.inc()
+            yield PdfPage(
+                number=number,
+                text=text,
+                images=self._images(page, number, collector) if extract_images else [],
+            )
+
+    def _images(self, page, number: int, collector: Optional[ImageCollector]) -> list[PdfImage]:
+        if collector is not None:
+            return collector.page_images(page, number)
+        return self._page_images(page, number)
+
+    def _page_images(self, page, page_num: int) -> list[PdfImage]:
+        from PIL import Image
 
-    def extract_text(self, pdf_bytes: bytes, extract_images: bool = False) -> PdfContent:
-        reader = PdfReader(io.BytesIO(pdf_bytes))
+        images = []
+        for img_index, image in enumerate(page.images):
+            try:
+                img_data = image.data
+                img = Image.open(io.BytesIO(img_data))
+                images.append(
+                    PdfImage(
+                        page=page_num,
+                        index=img_index,
+                        width=img.width,
+                        height=img.height,
+                        data=img_data,
+                        format=img.format or "unknown",
+                    )
+                )
+            except Exception:
+                continue
+        return images
+
+    def extract_text(
+        self,
+        source: PdfSource,
+        extract_images: bool = False,
+        pages: Optional[Iterable[int]] = None,
+    ) -> PdfContent:
+        pages = list(pages) if pages is not None else None
+        return self._memoized(
+            "text", source, self._text_options(extract_images, pages),
+            lambda: self._extract_text_uncached(source, extract_images, pages))
+
+    def _text_options(self, extract_images: bool, pages: Optional[list[int]]) -> dict:
+        options = {"extract_images": extract_images, "pages": pages}
+        if extract_images and self.image_mode != "decode":
+            options["image_mode"] = self.image_mode
+            options["image_dir"] = str(self.image_dir) if self.image_mode == "disk" else None
+        return options
+
+    def _extract_text_uncached(
+        self, source: PdfSource, extract_images: bool, pages: Optional[list[int]]
+    ) -> PdfContent:
+        with PDF_EXTRACT_SECONDS.time(operation="text"), self._open_reader(source) as reader:
+            return self._extract_text(reader, extract_images, pages)
+
+    def _extract_text(
+        self, reader: PdfReader, extract_images: bool, pages: Optional[Iterable[int]]
+    ) -> PdfContent:
         text_parts = []
         images = []
 
-        for page_num, page in enumerate(reader.pages):
-            text_parts.append(page.extract_text() or "")
-
-            if extract_images:
-                for img_index, image in enumerate(page.images):
-                    try:
-                        img_data = image.data
-                        img = Image.open(io.BytesIO(img_data))
-                        images.append(
-                            PdfImage(
-                                page=page_num + 1,
-                                index=img_index,
-                                width=img.width,
-                                height=img.height,
-                                data=img_data,
-                                format=img.format or "unknown",
-                            )
-                        )
-                    except Exception:
-                        continue
+        for page in self._iter_pages(reader, pages, extract_images):
+            text_parts.append(page.text)
+            images.extend(page.images)
 
         metadata = {}
         if reader.metadata:
@@ -84,157 +413,316 @@ class PdfExtractor:
             images=images,
         )
 
-    async def extract_from_url(
-        self, session: aiohttp.ClientSession, url: str, extract_images: bool = False
+    async def extract_text_async(
+        self,
+        source: PdfSource,
+        extract_images: bool = False,
+        pages: Optional[Iterable[int]] = None,
     ) -> PdfContent:
-        pdf_bytes = await self.fetch_pdf(session, url)
-        return self.extract_text(pdf_bytes, extract_images)
+        pages = list(pages) if pages is not None else None
+        return await self._memoized_async(
+            "text", source, self._text_options(extract_images, pages),
+            lambda: self._extract_text_chunked(source, extract_images, pages))
 
-    def extract_questions(self, text: str) -> list[dict]:
-        questions = []
-        pattern = r"(?:^|\n)\s*(\d{1,3})\s*\n"
-        matches = list(re.finditer(pattern, text))
-
-        if not matches:
-            pattern = r"(?:QUESTÃO|Questão|QUEST[ÃA]O)\s*[:\-]?\s*(\d+)"
-            matches = list(re.finditer(pattern, text))
-
-        seen_numbers = set()
-        for i, match in enumerate(matches):
-            num = int(match.group(1))
-            if num in seen_numbers or num > 200:
-                continue
-            seen_numbers.add(num)
-
-            start = match.start()
-            end = matches[i + 1].start() if i + \
-                1 < len(matches) else min(start + 3000, len(text))
-            question_text = text[start:end].strip()
+    async def _extract_text_chunked(
+        self, source: PdfSource, extract_images: bool, pages: Optional[list[int]]
+    ) -> PdfContent:
+        numbers = pages
+        if self.pages_per_job > 0 and (pages is None or len(pages) > self.pages_per_job):
+            num_pages = await asyncio.to_thread(self._count_pages, source)
+            numbers = [
+                number for number in (pages if pages is not None else range(1, num_pages + 1))
+                if 1 <= number <= num_pages
+            ]
+        if self.pages_per_job <= 0 or len(numbers) <= self.pages_per_job:
+            return await self._run_job(
+                _extract_text_job, source, extract_images, pages, self.image_mode, self.image_dir)
+
+        parts = await asyncio.gather(*(
+            self._run_job(
+                _extract_text_job, source, extract_images, numbers[i:i + self.pages_per_job],
+                self.image_mode, self.image_dir)
+            for i in range(0, len(numbers), self.pages_per_job)
+        ))
+        return PdfContent(
+            text="\n\n".join(part.text for part in parts),
+            num_pages=parts[0].num_pages,
+            metadata=parts[0].metadata,
+            images=merge_images([part.images for part in parts]),
+        )
 
-            if len(question_text) < 50:
-                continue
+    def _count_pages(self, source: PdfSource) -> int:
+        with self._open_reader(source) as reader:
+            return len(reader.pages)
+
+    def load_image(self, source: PdfSource, image: PdfImage) -> bytes:
+        if image.data is not None or image.path is not None:
+            return image.read()
+        if image.xref is None:
+            raise ValueError("Image has no object reference to load it from")
+        with self._open_reader(source) as reader:
+            return image_payload(reader.get_object(image.xref))[1]
+
+    async def extract_answer_keys_async(self, source: PdfSource) -> list[AnswerKey]:
+        return await self._memoized_job(
+            "answer_keys", source, {"pages": None}, _extract_answer_keys_job, source)
+
+    async def extract_answer_keys_stored(self, pdf: StoredPdf) -> list[AnswerKey]:
+        task = self._answer_key_tasks.get(pdf.sha256)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_answer_keys_deduplicated(pdf))
+            task.add_done_callback(lambda t, key=pdf.sha256: self._forget_failed(key, t))
+            self._answer_key_tasks[pdf.sha256] = task
+            while len(self._answer_key_tasks) > self.max_memoized:
+                self._answer_key_tasks.popitem(last=False)
+        else:
+            self._answer_key_tasks.move_to_end(pdf.sha256)
+        return await asyncio.shield(task)
+
+    async def _extract_answer_keys_deduplicated(self, pdf: StoredPdf) -> list[AnswerKey]:
+        index = self.near_duplicates
+        if index is None or self.results_cache is None:
+            return await self.extract_answer_keys_async(pdf)
+
+        key, answer_keys = await asyncio.to_thread(self._lookup, "answer_keys", pdf, {"pages": None})
+        if answer_keys is not None:
+            return answer_keys
+
+        try:
+            digest = await self._run_job(_content_digest_job, pdf)
+        except Exception:
+            digest = None
+        canonical = None
+        if digest is not None:
+            canonical = await asyncio.to_thread(index.find_document, digest, pdf.sha256)
+        if canonical is not None:
+            canonical_key = self.results_cache.key(canonical, "answer_keys", {"pages": None})
+            answer_keys = await asyncio.to_thread(self.results_cache.get, canonical_key)
+            if answer_keys is not None:
+                NEAR_DUPLICATES.inc(kind="content")
+                await asyncio.to_thread(self.results_cache.put, key, answer_keys)
+                await asyncio.to_thread(index.add_document, pdf.sha256, digest, canonical)
+                return answer_keys
+
+        answer_keys = await self._run_job(_extract_answer_keys_job, pdf)
+        await asyncio.to_thread(self.results_cache.put, key, answer_keys)
+        await asyncio.to_thread(self._record_signatures, pdf.sha256, digest, answer_keys, canonical)
+        return answer_keys
 
-            questions.append(
-                {
-                    "number": num,
-                    "text": question_text[:3000],
-                }
-            )
+    def _record_signatures(
+        self,
+        sha256: str,
+        digest: Optional[str],
+        answer_keys: list[AnswerKey],
+        canonical: Optional[str],
+    ) -> None:
+        index = self.near_duplicates
+        answers_signature = index.hasher.answers_signature(answer_keys)
+        if answers_signature is not None:
+            match = index.find("answers", answers_signature, sha256)
+            if match is not None:
+                NEAR_DUPLICATES.inc(kind="answers")
+                canonical = canonical or match[0]
+            index.add("answers", sha256, answers_signature, canonical)
+        if digest is not None:
+            index.add_document(sha256, digest, canonical)
+
+    def content_digest(self, source: PdfSource) -> str:
+        digest = hashlib.sha256()
+        memo: dict[int, bytes] = {}
+        with self._open_reader(source) as reader:
+            digest.update(len(reader.pages).to_bytes(4, "little"))
+            for page in reader.pages:
+                contents = page.get("/Contents")
+                contents = contents.get_object() if contents is not None else ArrayObject()
+                for stream in contents if isinstance(contents, ArrayObject) else (contents,):
+                    digest.update(_stream_digest(stream))
+                digest.update(_resources_digest(page.get("/Resources"), memo))
+        return digest.hexdigest()
+
+    def duplicate_of(self, sha256: str) -> Optional[str]:
+        index = self.near_duplicates
+        return index.canonical(sha256) if index is not None else None
+
+    def _forget_failed(self, key: str, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            if self._answer_key_tasks.get(key) is task:
+                del self._answer_key_tasks[key]
+
+    async def extract_from_url(self, url: str, extract_images: bool = False) -> PdfContent:
+        stored = await self.download_pdf(url)
+        return await self.extract_text_async(stored, extract_images)
 
-        questions.sort(key=lambda q: q["number"])
-        return questions
+    def extract_questions(self, text: str) -> list[dict]:
+        segmenter = QuestionSegmenter()
+        spans = [*segmenter.feed(text), *segmenter.close()]
+        spans.sort(key=lambda span: span.number)
+        return [{"number": span.number, "text": span.text(text)} for span in spans]
+
+    def iter_questions(
+        self, source: PdfSource, pages: Optional[Iterable[int]] = None
+    ) -> Iterator[QuestionSpan]:
+        segmenter = QuestionSegmenter()
+        for page in self.iter_pages(source, pages):
+            yield from segmenter.feed(page.text, page.number)
+        yield from segmenter.close()
+
+    def extract_questions_from_pdf(self, source: PdfSource) -> list[dict]:
+        return self._memoized(
+            "questions", source, {},
+            lambda: self.extract_questions(self.extract_text(source).text))
 
     def extract_answer_keys(self, text: str) -> list[AnswerKey]:
-        text = re.sub(r"pcimarkpci\s*\S+", "", text)
-        text = re.sub(r"www\.pciconcursos\.com\.br", "", text)
-        text = re.sub(r"Página\s*\d+\s*de\s*\d+", "", text)
-        text = re.sub(r"([A-ZÀ-Ÿ])\n([A-ZÀ-Ÿ])", r"\1\2", text)
-
-        answer_keys = []
-
-        cargo_patterns = [
-            (r"M(\d+)\s*[-–]\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)(?:\n|PROVA)", "m_pattern"),
-            (r"([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+(?:Militar|Bombeiro|Polícia|Civil|Perito|Tenente|Soldado|Oficial|Agente|Contador|Analista|Técnico|Escriturário|Assistente|Auxiliar|Administrador|Engenheiro|Advogado|Médico|Enfermeiro|Professor|Fiscal|Auditor|Delegado|Escrivão|Inspetor|Motorista|Operador|Secretário|Gestor|Coordenador|Supervisor|Gerente|Diretor)[A-Za-zÀ-ÿº\s\-–]*)[–\-]\s*Tipo\s*(\d+)", "tipo"),
-            (r"(?:GABARITO\s*(?:OFICIAL|DEFINITIVO|PRELIMINAR)?)\s*\n?\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]+?)\s+Prova\s*[-–]?\s*([A-Z0-9]+)", "prova"),
-            (r"\n\s*([A-ZÀ-Ÿ][A-ZÀ-Ÿ\s\-–]+(?:ÁRIO|ISTA|OR|ENTE|IVO|ICO|IRO|ADO|IDO|OSO|ÃO|EIRO|ADOR)[A-ZÀ-Ÿ\s\-–]*)\s*\n\s*(?=\d+\s*[-–:]?\s*[A-E])", "uppercase"),
-        ]
-
-        for pattern, pattern_type in cargo_patterns:
-            blocks = list(re.finditer(
-                pattern, text, re.IGNORECASE | re.MULTILINE))
-
-            for i, match in enumerate(blocks):
-                if pattern_type == "m_pattern":
-                    tipo = match.group(1).strip()
-                    exam_name = match.group(2).strip()
-                else:
-                    exam_name = match.group(1).strip()
-                    tipo = match.group(2).strip(
-                    ) if match.lastindex >= 2 else "1"
-
-                exam_name = re.sub(r"^(GABARITO\s*(DEFINITIVO|PRELIMINAR|OFICIAL)?\s*)",
-                                   "", exam_name, flags=re.IGNORECASE).strip()
-                exam_name = re.sub(r"^\d*º?\s*", "", exam_name).strip()
-                exam_name = re.sub(r"\s+", " ", exam_name).strip()
-
-                if len(exam_name) < 4 or exam_name.upper() in ("PROVA", "GABARITO", "TIPO"):
-                    continue
-
-                start = match.end()
-                next_match_start = blocks[i + 1].start() if i + \
-                    1 < len(blocks) else len(text)
-                end = next_match_start
+        with ANSWER_KEY_PARSE_SECONDS.time():
+            return answer_key_parser.parse(text)
 
-                block_text = text[start:end]
-
-                answers = self._extract_answers_from_block(block_text)
+    def extract_answer_keys_from_pdf(
+        self, source: PdfSource, pages: Optional[Iterable[int]] = None
+    ) -> list[AnswerKey]:
+        pages = list(pages) if pages is not None else None
+        return self._memoized(
+            "answer_keys", source, {"pages": pages},
+            lambda: self._extract_answer_keys_uncached(source, pages))
 
-                if answers and len(answers) >= 5:
-                    existing = next(
-                        (ak for ak in answer_keys if ak.exam_name == exam_name and ak.tipo == tipo), None)
-                    if not existing:
-                        answer_keys.append(
-                            AnswerKey(exam_name=exam_name, tipo=tipo, answers=answers))
+    def _extract_answer_keys_uncached(
+        self, source: PdfSource, pages: Optional[list[int]]
+    ) -> list[AnswerKey]:
+        with PDF_EXTRACT_SECONDS.time(operation="answer_keys"):
+            answer_keys = self._scan_answer_keys(source, pages)
+        ANSWER_KEYS.inc(len(answer_keys))
+        ANSWERS_PER_PDF.observe(sum(key.num_answers for key in answer_keys))
+        return answer_keys
 
-            if answer_keys:
-                break
+    def _scan_answer_keys(
+        self, source: PdfSource, pages: Optional[list[int]]
+    ) -> list[AnswerKey]:
+        text_parts = []
+        answers_end = 0
+        pages_without_answers = 0
 
-        if not answer_keys:
-            answers = self._extract_answers_from_block(text)
-            if answers and len(answers) >= 5:
-                exam_name = self._extract_exam_name_from_text(text)
-                answer_keys.append(
-                    AnswerKey(exam_name=exam_name, tipo="1", answers=answers))
+        for page in self.iter_pages(source, pages):
+            text_parts.append(page.text)
 
-        return answer_keys
+            if answer_key_parser.has_answers(page.text):
+                answers_end = len(text_parts)
+                pages_without_answers = 0
+                continue
 
-    def _extract_exam_name_from_text(self, text: str) -> str:
-        patterns = [
-            r"(?:GABARITO\s*(?:OFICIAL|DEFINITIVO|PRELIMINAR)?)\s*\n?\s*([A-ZÀ-Ÿ][A-Za-zÀ-ÿº\s\-–]{5,50})",
-            r"([A-Z][A-Z\s\-–]+(?:ÁRIO|ISTA|OR|ENTE|IVO|ICO|IRO|ADO|IDO|OSO)[A-Z\s\-–]*)",
-            r"CARGO:\s*([A-Za-zÀ-ÿº\s\-–]+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                name = match.group(1).strip()
-                name = re.sub(r"\s+", " ", name)
-                if len(name) >= 5:
-                    return name
-        return "Unknown"
-
-    def _extract_answers_from_block(self, block_text: str) -> dict[int, str]:
-        answers = {}
-
-        table_pattern = r"(\d+(?:\s+\d+){4,})\s*\n\s*([A-EX](?:\s+[A-EX]){4,})"
-        for match in re.finditer(table_pattern, block_text, re.IGNORECASE):
-            nums = [int(n) for n in match.group(1).split()]
-            letters = match.group(2).upper().split()
-            for num, letter in zip(nums, letters):
-                if 1 <= num <= 200 and letter in "ABCDEX":
-                    answers[num] = letter
-
-        if answers:
-            return answers
-
-        patterns = [
-            r"(\d{1,3})\s*[-–:]\s*([A-EX])",
-            r"(\d{1,3})\s*[\.]\s*([A-EX])",
-            r"\b(\d{1,3})\s+([A-EX])\b",
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, block_text, re.IGNORECASE)
-            for num_str, letter in matches:
-                num = int(num_str)
-                if 1 <= num <= 200 and letter.upper() in "ABCDEX":
-                    if num not in answers:
-                        answers[num] = letter.upper()
-
-        return answers
-
-    async def extract_answer_keys_from_url(
-        self, session: aiohttp.ClientSession, url: str
-    ) -> list[AnswerKey]:
-        pdf_content = await self.extract_from_url(session, url)
-        return self.extract_answer_keys(pdf_content.text)
+            pages_without_answers += 1
+            if answers_end and pages_without_answers >= EARLY_EXIT_PAGES:
+                answer_keys = self.extract_answer_keys("\n\n".join(text_parts[:answers_end]))
+                if answer_keys:
+                    return answer_keys
+                answers_end = 0
+
+        return self.extract_answer_keys("\n\n".join(text_parts))
+
+    async def extract_answer_keys_from_url(self, url: str) -> list[AnswerKey]:
+        stored = await self.download_pdf(url)
+        return await self.extract_answer_keys_stored(stored)
+
+
+def _extract_text_job(
+    source: PdfSource,
+    extract_images: bool,
+    pages: Optional[list[int]],
+    image_mode: str,
+    image_dir: Path,
+    drain_metrics: bool,
+) -> tuple[PdfContent, Optional[MetricsDelta]]:
+    extractor = PdfExtractor(image_mode=image_mode, image_dir=image_dir)
+    content = extractor._extract_text_uncached(source, extract_images, pages)
+    return content, metrics.drain() if drain_metrics else None
+
+
+def _extract_answer_keys_job(
+    source: PdfSource, drain_metrics: bool
+) -> tuple[list[AnswerKey], Optional[MetricsDelta]]:
+    answer_keys = PdfExtractor()._extract_answer_keys_uncached(source, None)
+    return answer_keys, metrics.drain() if drain_metrics else None
+
+
+def _content_digest_job(
+    source: PdfSource, drain_metrics: bool
+) -> tuple[str, Optional[MetricsDelta]]:
+    digest = PdfExtractor().content_digest(source)
+    return digest, metrics.drain() if drain_metrics else None
+
+
+def _stream_digest(stream) -> bytes:
+    # Hash the stream as stored, filters included, instead of decoding it: the
+    # digest only has to match byte-identical content, and inflating every page
+    # cost a third of the early-exit parse it is meant to skip.
+    stream = stream.get_object()
+    return hashlib.sha256(str(stream.get("/Filter")).encode() + stream._data).digest()
+
+
+def _resources_digest(resources, memo: dict[int, bytes]) -> bytes:
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return b""
+
+    digest = hashlib.sha256()
+    for category in ("/Font", "/XObject"):
+        entries = resources.get(category)
+        if not entries:
+            continue
+        for name, ref in sorted(entries.get_object().items()):
+            xref = ref.idnum if isinstance(ref, IndirectObject) else None
+            if xref is None or xref not in memo:
+                obj = ref.get_object()
+                if category == "/Font":
+                    value = _font_digest(obj)
+                elif obj.get("/Subtype") == "/Form":
+                    if xref is not None:
+                        memo[xref] = b"form"
+                    value = _stream_digest(obj) + _resources_digest(obj.get("/Resources"), memo)
+                else:
+                    value = b""
+                if xref is None:
+                    digest.update(name.encode() + value)
+                    continue
+                memo[xref] = value
+            digest.update(name.encode() + memo[xref])
+    return digest.digest()
+
+
+def _font_digest(font) -> bytes:
+    digest = hashlib.sha256(str(font.get("/BaseFont")).encode())
+    for entry in ("/ToUnicode", "/Encoding"):
+        value = font.get(entry)
+        if value is None:
+            continue
+        value = value.get_object()
+        if isinstance(value, StreamObject):
+            digest.update(_stream_digest(value))
+        else:
+            differences = value.get("/Differences") if hasattr(value, "get") else value
+            digest.update(repr(differences).encode())
+    for descendant in font.get("/DescendantFonts") or ():
+        digest.update(str(descendant.get_object().get("/BaseFont")).encode())
+    return digest.digest()
+
+
+def _source_sha256(source: PdfSource) -> str:
+    if isinstance(source, StoredPdf):
+        return source.sha256
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_default_results_cache: Optional[ExtractionCache] = None
+
+
+def get_default_results_cache() -> Optional[ExtractionCache]:
+    global _default_results_cache
+    if not settings.extraction_cache_enabled:
+        return None
+    if _default_results_cache is None:
+        _default_results_cache = ExtractionCache(EXTRACTOR_VERSIONS)
+    return _default_results_cache
@@ -0,0 +1,164 @@
+import hashlib
+import io
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from pypdf.generic import ArrayObject, IndirectObject
+
+from src.services.lru_index import write_atomic
+
+IMAGE_MODES = ("decode", "headers", "disk")
+
+PASSTHROUGH_FORMATS = {
+    "/DCTDecode": ("JPEG", "jpg"),
+    "/JPXDecode": ("JPEG2000", "jp2"),
+}
+
+FILTER_FORMATS = {
+    "/FlateDecode": "FLATE",
+    "/LZWDecode": "LZW",
+    "/RunLengthDecode": "RUNLENGTH",
+    "/CCITTFaxDecode": "CCITT",
+    "/JBIG2Decode": "JBIG2",
+}
+
+
+@dataclass
+class PdfImage:
+    page: int
+    index: int
+    width: int
+    height: int
+    data: Optional[bytes]
+    format: str
+    sha256: Optional[str] = None
+    xref: Optional[int] = None
+    path: Optional[Path] = None
+    pages: list[int] = field(default_factory=list)
+
+    def read(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        if self.path is not None:
+            return self.path.read_bytes()
+        raise ValueError("Image data was not kept; load it with PdfExtractor.load_image()")
+
+
+def _last_filter(xobject) -> Optional[str]:
+    filters = xobject.get("/Filter")
+    if isinstance(filters, ArrayObject):
+        filters = filters[-1] if filters else None
+    return str(filters) if filters is not None else None
+
+
+def image_format(xobject) -> str:
+    name = _last_filter(xobject)
+    if name in PASSTHROUGH_FORMATS:
+        return PASSTHROUGH_FORMATS[name][0]
+    return FILTER_FORMATS.get(name, "RAW")
+
+
+def image_payload(xobject) -> tuple[str, bytes]:
+    name = _last_filter(xobject)
+    if name in PASSTHROUGH_FORMATS:
+        return PASSTHROUGH_FORMATS[name][1], xobject.get_data()
+
+    buffer = io.BytesIO()
+    xobject.decode_as_image().save(buffer, "PNG")
+    return "png", buffer.getvalue()
+
+
+def iter_image_xobjects(resources, visited: Optional[set[int]] = None) -> Iterator[tuple[Optional[int], object]]:
+    if visited is None:
+        visited = set()
+    resources = resources.get_object() if resources is not None else None
+    xobjects = resources.get("/XObject") if resources else None
+    if not xobjects:
+        return
+
+    for ref in xobjects.get_object().values():
+        xref = ref.idnum if isinstance(ref, IndirectObject) else None
+        xobject = ref.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            yield xref, xobject
+        elif subtype == "/Form" and xref not in visited:
+            if xref is not None:
+                visited.add(xref)
+            yield from iter_image_xobjects(xobject.get("/Resources"), visited)
+
+
+class ImageCollector:
+    def __init__(self, mode: str, directory: Optional[Path] = None):
+        if mode not in ("headers", "disk"):
+            raise ValueError(f"ImageCollector does not support image mode: {mode}")
+        self.mode = mode
+        self.directory = directory
+        if mode == "disk":
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._by_xref: dict[int, PdfImage] = {}
+        self._by_hash: dict[str, PdfImage] = {}
+
+    def page_images(self, page, number: int) -> list[PdfImage]:
+        images = []
+        for index, (xref, xobject) in enumerate(iter_image_xobjects(page.get("/Resources"))):
+            image = self._by_xref.get(xref) if xref is not None else None
+            if image is None:
+                try:
+                    image = self._collect(xobject, number, index, xref)
+                except Exception:
+                    continue
+                if image.page == number and image.index == index:
+                    images.append(image)
+                if xref is not None:
+                    self._by_xref[xref] = image
+            if number not in image.pages:
+                image.pages.append(number)
+        return images
+
+    def _collect(self, xobject, number: int, index: int, xref: Optional[int]) -> PdfImage:
+        sha256 = hashlib.sha256(xobject.get_data()).hexdigest()
+        image = self._by_hash.get(sha256)
+        if image is not None:
+            return image
+
+        image = PdfImage(
+            page=number,
+            index=index,
+            width=int(xobject.get("/Width", 0)),
+            height=int(xobject.get("/Height", 0)),
+            data=None,
+            format=image_format(xobject),
+            sha256=sha256,
+            xref=xref,
+        )
+        if self.mode == "disk":
+            image.path = self._save(sha256, xobject)
+        self._by_hash[sha256] = image
+        return image
+
+    def _save(self, sha256: str, xobject) -> Path:
+        existing = next(self.directory.glob(f"{sha256}.*"), None)
+        if existing is not None:
+            return existing
+        extension, payload = image_payload(xobject)
+        path = self.directory / f"{sha256}.{extension}"
+        write_atomic(path, payload)
+        return path
+
+
+def merge_images(parts: list[list[PdfImage]]) -> list[PdfImage]:
+    images = []
+    by_hash: dict[str, PdfImage] = {}
+    for part in parts:
+        for image in part:
+            known = by_hash.get(image.sha256) if image.sha256 is not None else None
+            if known is None:
+                images.append(image)
+                if image.sha256 is not None:
+                    by_hash[image.sha256] = image
+            else:
+                known.pages.extend(page for page in image.pages if page not in known.pages)
+    return images
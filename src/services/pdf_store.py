@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from src.config import settings
+from src.services.lru_index import LruIndex
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class PdfTooLargeError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredPdf:
+    sha256: str
+    path: Path
+    size: int
+
+
+class PdfStore:
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        max_bytes: int = settings.max_pdf_mb * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+        max_store_bytes: int = settings.pdf_store_max_mb * 1024 * 1024,
+    ):
+        self.directory = Path(directory or Path(settings.download_dir) / "pdfs")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._tmp_dir = self.directory / "tmp"
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._pins: Counter[str] = Counter()
+        self._pins_lock = threading.Lock()
+        self._lru = LruIndex(max_store_bytes, self._remove, self.is_pinned)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.directory.glob("??/*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        self._lru.load(entries)
+
+    @property
+    def size(self) -> int:
+        return self._lru.size
+
+    def path_for(self, sha256: str) -> Path:
+        return self.directory / sha256[:2] / f"{sha256}.pdf"
+
+    def get(self, sha256: str) -> Optional[StoredPdf]:
+        path = self.path_for(sha256)
+        try:
+            stored = StoredPdf(sha256=sha256, path=path, size=path.stat().st_size)
+        except FileNotFoundError:
+            self._lru.discard(sha256)
+            return None
+        self._touch(sha256, path)
+        return stored
+
+    def pin(self, sha256: str) -> None:
+        with self._pins_lock:
+            self._pins[sha256] += 1
+
+    def unpin(self, sha256: str) -> None:
+        with self._pins_lock:
+            self._pins[sha256] -= 1
+            if self._pins[sha256] <= 0:
+                del self._pins[sha256]
+
+    def is_pinned(self, sha256: str) -> bool:
+        with self._pins_lock:
+            return sha256 in self._pins
+
+    async def save_response(self, response: "aiohttp.ClientResponse") -> StoredPdf:
+        if response.content_length and response.content_length > self.max_bytes:
+            raise PdfTooLargeError(
+                f"{response.url} is {response.content_length} bytes, limit is {self.max_bytes}"
+            )
+
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_name = await asyncio.to_thread(tempfile.mkstemp, dir=self._tmp_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise PdfTooLargeError(
+                            f"{response.url} exceeds the limit of {self.max_bytes} bytes"
+                        )
+                    hasher.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            return await asyncio.to_thread(self._commit, Path(tmp_name), hasher.hexdigest(), size)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def save_bytes(self, data: bytes) -> StoredPdf:
+        if len(data) > self.max_bytes:
+            raise PdfTooLargeError(f"PDF is {len(data)} bytes, limit is {self.max_bytes}")
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        existing = self.get(sha256)
+        if existing:
+            return existing
+
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self._commit(Path(tmp_name), sha256, len(data))
+
+    def _commit(self, tmp_path: Path, sha256: str, size: int) -> StoredPdf:
+        path = self.path_for(sha256)
+        if path.exists():
+            tmp_path.unlink(missing_ok=True)
+            self._touch(sha256, path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, path)
+        self._lru.track(sha256, size)
+        return StoredPdf(sha256=sha256, path=path, size=size)
+
+    def _touch(self, sha256: str, path: Path) -> None:
+        self._lru.touch(sha256)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, sha256: str) -> None:
+        self.path_for(sha256).unlink(missing_ok=True)
+
+
+_default_store: Optional[PdfStore] = None
+
+
+def get_default_store() -> PdfStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = PdfStore()
+    return _default_store
@@ -0,0 +1,176 @@
+import bisect
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+QUESTION_PATTERNS = (
+    re.compile(r"(?:^|\n)\s*(\d{1,3})\s*\n"),
+    re.compile(r"(?:QUESTÃO|Questão|QUEST[ÃA]O)\s*[:\-]?\s*(\d+)"),
+)
+
+PAGE_SEPARATOR = "\n\n"
+CARRY_WORDS = 4
+
+
+@dataclass
+class QuestionSpan:
+    number: int
+    start: int
+    end: int
+    first_page: int
+    last_page: int
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+
+@dataclass
+class _OpenQuestion:
+    number: int
+    start: int
+    cap: int
+    capped_end: Optional[int] = None
+
+
+class _Matcher:
+    def __init__(self, pattern: re.Pattern):
+        self.pattern = pattern
+        self.pos = 0
+        self.matched = False
+        self.seen: set[int] = set()
+        self.open: Optional[_OpenQuestion] = None
+        self.spans: list[QuestionSpan] = []
+
+
+class QuestionSegmenter:
+    def __init__(self, max_number: int = 200, max_chars: int = 3000, min_chars: int = 50):
+        self.max_number = max_number
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self._primary, self._fallback = (_Matcher(pattern) for pattern in QUESTION_PATTERNS)
+        self._buffer = ""
+        self._base = 0
+        self._content_end = 0
+        self._page_starts: list[int] = []
+        self._page_numbers: list[int] = []
+
+    @property
+    def _matchers(self) -> list[_Matcher]:
+        if self._primary.matched:
+            return [self._primary]
+        return [self._primary, self._fallback]
+
+    def feed(self, text: str, page: Optional[int] = None) -> Iterator[QuestionSpan]:
+        if self._page_starts:
+            self._buffer += PAGE_SEPARATOR
+        self._page_starts.append(self._base + len(self._buffer))
+        self._page_numbers.append(page if page is not None else len(self._page_numbers) + 1)
+        self._buffer += text
+
+        yield from self._scan(final=False)
+        self._trim()
+
+    def close(self) -> Iterator[QuestionSpan]:
+        yield from self._scan(final=True)
+        total = self._base + len(self._buffer)
+        for matcher in self._matchers:
+            if matcher.open is not None:
+                open_question, matcher.open = matcher.open, None
+                if open_question.cap < total:
+                    self._finish(matcher, open_question, open_question.cap, open_question.capped_end)
+                else:
+                    self._finish(matcher, open_question, total)
+
+        matcher = self._primary if self._primary.matched else self._fallback
+        yield from matcher.spans
+        matcher.spans.clear()
+
+    def _scan(self, final: bool) -> Iterator[QuestionSpan]:
+        limit = len(self._buffer) if final else len(self._buffer.rstrip())
+        self._advance(self._primary, limit, final)
+        if self._primary.matched:
+            self._fallback.open = None
+            self._fallback.spans.clear()
+            yield from self._primary.spans
+            self._primary.spans.clear()
+        else:
+            self._advance(self._fallback, limit, final)
+
+    def _advance(self, matcher: _Matcher, limit: int, final: bool) -> None:
+        while True:
+            match = matcher.pattern.search(self._buffer, matcher.pos - self._base)
+            if match is None or (not final and match.end() >= limit):
+                return
+            self._accept(matcher, match)
+
+    def _accept(self, matcher: _Matcher, match: re.Match) -> None:
+        matcher.matched = True
+        start = self._base + match.start()
+        if matcher.open is not None:
+            self._finish(matcher, matcher.open, start)
+            matcher.open = None
+
+        number = int(match.group(1))
+        if number not in matcher.seen and number <= self.max_number:
+            matcher.seen.add(number)
+            matched = match.group()
+            matcher.open = _OpenQuestion(
+                number=number,
+                start=start + len(matched) - len(matched.lstrip()),
+                cap=start + self.max_chars,
+            )
+        matcher.pos = self._base + match.end()
+
+    def _finish(
+        self,
+        matcher: _Matcher,
+        question: _OpenQuestion,
+        boundary: int,
+        content_end: Optional[int] = None,
+    ) -> None:
+        if content_end is None:
+            content_end = self._content_before(boundary)
+        if content_end - question.start < self.min_chars:
+            return
+        end = min(content_end, question.start + self.max_chars)
+        matcher.spans.append(QuestionSpan(
+            number=question.number,
+            start=question.start,
+            end=end,
+            first_page=self._page_at(question.start),
+            last_page=self._page_at(end - 1),
+        ))
+
+    def _content_before(self, boundary: int) -> int:
+        kept = len(self._buffer[:boundary - self._base].rstrip())
+        return self._base + kept if kept else self._content_end
+
+    def _page_at(self, offset: int) -> int:
+        return self._page_numbers[max(bisect.bisect_right(self._page_starts, offset) - 1, 0)]
+
+    def _trim(self) -> None:
+        words = self._buffer.rsplit(None, CARRY_WORDS)
+        if len(words) <= CARRY_WORDS:
+            return
+        cut = len(words[0])
+        for matcher in self._matchers:
+            cut = min(cut, matcher.pos - self._base)
+        cut -= 1
+        if cut <= 0:
+            return
+
+        for matcher in self._matchers:
+            question = matcher.open
+            if question is not None and question.capped_end is None and question.cap <= self._base + cut:
+                question.capped_end = self._content_before(question.cap)
+        self._content_end = self._content_before(self._base + cut)
+        self._buffer = self._buffer[cut:]
+        self._base += cut
+
+
+def segment_questions(pages: Iterable[tuple[int, str]], **options) -> Iterator[QuestionSpan]:
+    segmenter = QuestionSegmenter(**options)
+    for number, text in pages:
+        yield from segmenter.feed(text, number)
+    yield from segmenter.close()
@@ -0,0 +1,130 @@
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+from src.models import Exam, ExamDownload
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+    page_url TEXT PRIMARY KEY,
+    source TEXT,
+    name TEXT NOT NULL,
+    year TEXT,
+    organization TEXT,
+    institution TEXT,
+    level TEXT,
+    exam_url TEXT,
+    answer_key_url TEXT,
+    enriched INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    first_seen REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exams_source ON exams (source);
+"""
+
+
+class StateStore:
+    def __init__(self, path: Optional[str | Path] = None):
+        self.path = Path(path or settings.state_db_path or Path(settings.download_dir) / "state.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(exams)")}
+        if "processed" not in columns:
+            with self._conn:
+                self._conn.execute(
+                    "ALTER TABLE exams ADD COLUMN processed INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("UPDATE exams SET processed = enriched")
+
+    def processed(self, page_urls: Iterable[str]) -> set[str]:
+        page_urls = list(page_urls)
+        processed = set()
+        for i in range(0, len(page_urls), 500):
+            chunk = page_urls[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT page_url FROM exams WHERE processed = 1 AND page_url IN ({placeholders})",
+                chunk,
+            )
+            processed.update(row[0] for row in rows)
+        return processed
+
+    def record_processed(self, exams: Iterable[tuple[Exam, Optional[str]]]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO exams (page_url, source, name, year, organization, institution,
+                                   level, exam_url, answer_key_url, processed,
+                                   first_seen, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (page_url) DO UPDATE SET
+                    source = COALESCE(exams.source, excluded.source),
+                    processed = 1,
+                    updated = excluded.updated
+                """,
+                [
+                    (exam.page_url, source, exam.name, exam.year, exam.organization,
+                     exam.institution, exam.level, exam.download.exam_url,
+                     exam.download.answer_key_url, now, now)
+                    for exam, source in exams
+                ],
+            )
+
+    def get_download(self, page_url: str) -> Optional[ExamDownload]:
+        row = self._conn.execute(
+            "SELECT exam_url, answer_key_url FROM exams WHERE page_url = ? AND enriched = 1",
+            (page_url,),
+        ).fetchone()
+        if row is None:
+            return None
+        return ExamDownload(exam_url=row[0], answer_key_url=row[1])
+
+    def record_download(self, exam: Exam) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO exams (page_url, name, year, organization, institution,
+                                   level, exam_url, answer_key_url, enriched,
+                                   first_seen, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (page_url) DO UPDATE SET
+                    exam_url = excluded.exam_url,
+                    answer_key_url = excluded.answer_key_url,
+                    enriched = 1,
+                    updated = excluded.updated
+                """,
+                (exam.page_url, exam.name, exam.year, exam.organization, exam.institution,
+                 exam.level, exam.download.exam_url, exam.download.answer_key_url, now, now),
+            )
+
+    def stats(self) -> list[tuple[Optional[str], int, int, int]]:
+        return self._conn.execute(
+            """
+            SELECT source, COUNT(*), SUM(enriched), SUM(answer_key_url IS NOT NULL)
+            FROM exams GROUP BY source ORDER BY source
+            """
+        ).fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_default_state: Optional[StateStore] = None
+
+
+def get_default_state() -> StateStore:
+    global _default_state
+    if _default_state is None:
+        _default_state = StateStore()
+    return _default_state
@@ -0,0 +1,18 @@
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.sinks.base import BatchSink
+    from src.sinks.jsonl import JsonlSink
+    from src.sinks.parquet import ParquetSink
+    from src.sinks.writer import ResultWriter
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "src.sinks.base": ("BatchSink",),
+    "src.sinks.jsonl": ("JsonlSink",),
+    "src.sinks.parquet": ("ParquetSink",),
+    "src.sinks.writer": ("ResultWriter",),
+})
+
+__all__ = ["BatchSink", "JsonlSink", "ParquetSink", "ResultWriter"]
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+
+ColumnTypes = dict[str, str]
+
+
+class BatchSink(ABC):
+    suffix: str
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str,
+        columns: Optional[ColumnTypes] = None,
+        max_rows: int = settings.output_batch_rows,
+        max_seconds: float = settings.output_flush_seconds,
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.columns = columns
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.rows_written = 0
+        self.files_written = 0
+        self._next_file = 0
+        self._rows: list[dict] = []
+        self._last_flush = time.monotonic()
+        self._run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def due(self) -> bool:
+        return (
+            len(self._rows) >= self.max_rows
+            or time.monotonic() - self._last_flush >= self.max_seconds
+        )
+
+    def buffer(self, row: dict) -> None:
+        self._rows.append(row)
+
+    def write(self, row: dict) -> None:
+        self._rows.append(row)
+        if self.due:
+            self.flush()
+
+    async def write_async(self, row: dict) -> None:
+        self._rows.append(row)
+        if self.due:
+            await self.flush_async()
+
+    def flush(self) -> Optional[Path]:
+        batch = self._take_batch()
+        if batch is None:
+            return None
+        try:
+            self._write_batch(*batch)
+        except Exception:
+            self._restore(batch[1])
+            raise
+        return self._written(*batch)
+
+    async def flush_async(self) -> Optional[Path]:
+        batch = self._take_batch()
+        if batch is None:
+            return None
+        try:
+            await asyncio.to_thread(self._write_batch, *batch)
+        except Exception:
+            self._restore(batch[1])
+            raise
+        return self._written(*batch)
+
+    def _take_batch(self) -> Optional[tuple[Path, list[dict]]]:
+        self._last_flush = time.monotonic()
+        if not self._rows:
+            return None
+
+        rows, self._rows = self._rows, []
+        path = self.directory / (
+            f"{self.prefix}-{self._run_id}-{os.getpid()}-{self._next_file:05d}{self.suffix}"
+        )
+        self._next_file += 1
+        return path, rows
+
+    def _restore(self, rows: list[dict]) -> None:
+        self._rows[:0] = rows
+
+    def _write_batch(self, path: Path, rows: list[dict]) -> None:
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            self._write_rows(tmp_path, rows)
+            with open(tmp_path, "rb") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _written(self, path: Path, rows: list[dict]) -> Path:
+        self.rows_written += len(rows)
+        self.files_written += 1
+        return path
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "BatchSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def _write_rows(self, path: Path, rows: list[dict]) -> None:
+        pass
@@ -0,0 +1,13 @@
+import gzip
+import json
+from pathlib import Path
+
+from src.sinks.base import BatchSink
+
+
+class JsonlSink(BatchSink):
+    suffix = ".jsonl.gz"
+
+    def _write_rows(self, path: Path, rows: list[dict]) -> None:
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from src.sinks.base import BatchSink
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+class ParquetSink(BatchSink):
+    suffix = ".parquet"
+
+    def __init__(self, *args, **kwargs):
+        if pa is None:
+            raise ImportError("The parquet output format requires the 'pyarrow' package")
+        super().__init__(*args, **kwargs)
+        self._schema = self._build_schema()
+
+    def _build_schema(self):
+        if not self.columns:
+            return None
+        types = {"string": pa.string(), "int": pa.int32(), "float": pa.float64()}
+        return pa.schema([(name, types[kind]) for name, kind in self.columns.items()])
+
+    def _write_rows(self, path: Path, rows: list[dict]) -> None:
+        table = pa.Table.from_pylist(rows, schema=self._schema)
+        pq.write_table(table, path, compression="zstd")
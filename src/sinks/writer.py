@@ -0,0 +1,144 @@
+import asyncio
+from collections.abc import AsyncIterable, Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from src.config import settings
+from src.models import Exam
+from src.services import AnswerKey
+from src.sinks.base import BatchSink, ColumnTypes
+from src.sinks.jsonl import JsonlSink
+from src.sinks.parquet import ParquetSink
+
+if TYPE_CHECKING:
+    from src.pipeline import ExamResult
+
+EXAM_COLUMNS: ColumnTypes = {
+    "source": "string",
+    "name": "string",
+    "year": "string",
+    "organization": "string",
+    "institution": "string",
+    "level": "string",
+    "page_url": "string",
+    "exam_url": "string",
+    "answer_key_url": "string",
+    "answer_key_sha256": "string",
+    "duplicate_of": "string",
+}
+
+ANSWER_KEY_COLUMNS: ColumnTypes = {
+    "page_url": "string",
+    "exam_name": "string",
+    "tipo": "string",
+    "num_questions": "int",
+    "answers": "string",
+}
+
+SINKS: dict[str, type[BatchSink]] = {
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+class ResultWriter:
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        output_format: str = settings.output_format,
+        on_flush: Optional[Callable[[list["ExamResult"]], None]] = None,
+        **sink_options,
+    ):
+        try:
+            sink_class = SINKS[output_format]
+        except KeyError:
+            raise ValueError(f"Unknown output format: {output_format}") from None
+
+        directory = Path(directory or settings.output_dir)
+        self.exams = sink_class(directory, "exams", EXAM_COLUMNS, **sink_options)
+        self.answer_keys = sink_class(directory, "answer_keys", ANSWER_KEY_COLUMNS, **sink_options)
+        self.on_flush = on_flush
+        self._unflushed: list["ExamResult"] = []
+
+    def _exam_row(
+        self,
+        exam: Exam,
+        source: Optional[str] = None,
+        answer_key_sha256: Optional[str] = None,
+        duplicate_of: Optional[str] = None,
+    ) -> dict:
+        return {
+            "source": source,
+            **exam.to_row(),
+            "answer_key_sha256": answer_key_sha256,
+            "duplicate_of": duplicate_of,
+        }
+
+    def write_exam(
+        self,
+        exam: Exam,
+        source: Optional[str] = None,
+        answer_key_sha256: Optional[str] = None,
+        duplicate_of: Optional[str] = None,
+    ) -> None:
+        self.exams.write(self._exam_row(exam, source, answer_key_sha256, duplicate_of))
+
+    def write_answer_key(self, answer_key: AnswerKey, page_url: Optional[str] = None) -> None:
+        self.answer_keys.write({"page_url": page_url, **answer_key.to_row()})
+
+    def _buffer_result(self, result: "ExamResult") -> None:
+        self.exams.buffer(self._exam_row(
+            result.exam, result.source, result.pdf_sha256, result.duplicate_of))
+        for answer_key in result.answer_keys:
+            self.answer_keys.buffer({"page_url": result.exam.page_url, **answer_key.to_row()})
+        if self.on_flush is not None:
+            self._unflushed.append(result)
+
+    @property
+    def due(self) -> bool:
+        return self.exams.due or self.answer_keys.due
+
+    def write_result(self, result: "ExamResult") -> None:
+        self._buffer_result(result)
+        if self.due:
+            self.flush()
+
+    async def write_result_async(self, result: "ExamResult") -> None:
+        self._buffer_result(result)
+        if self.due:
+            await self.flush_async()
+
+    async def write_all(self, results: AsyncIterable["ExamResult"]) -> None:
+        async for result in results:
+            await self.write_result_async(result)
+        await self.flush_async()
+
+    def flush(self) -> None:
+        results, self._unflushed = self._unflushed, []
+        self.exams.flush()
+        self.answer_keys.flush()
+        self._flushed(results)
+
+    async def flush_async(self) -> None:
+        results, self._unflushed = self._unflushed, []
+        await asyncio.gather(self.exams.flush_async(), self.answer_keys.flush_async())
+        self._flushed(results)
+
+    def _flushed(self, results: list["ExamResult"]) -> None:
+        if results and self.on_flush is not None:
+            self.on_flush(results)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ResultWriter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.flush_async()
@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.answer_key_parser import PARITY_CASES, reference_clean, reference_parse, synthetic_gabarito
+from src.services.answer_key_parser import AnswerKeyParser
+
+SIZES = [1, 10, 100, 1000]
+
+PARITY_TEXTS = list(PARITY_CASES) + [synthetic_gabarito(blocks) for blocks in SIZES[:3]]
+
+
+@pytest.fixture(scope="module")
+def parser() -> AnswerKeyParser:
+    return AnswerKeyParser()
+
+
+@pytest.mark.parametrize("text", PARITY_TEXTS, ids=lambda text: text[:30])
+def test_parity_with_reference(parser: AnswerKeyParser, text: str) -> None:
+    assert parser.clean(text) == reference_clean(text)
+    keys = [(key.exam_name, key.tipo, key.answers) for key in parser.parse(text)]
+    assert keys == reference_parse(text)
+
+
+@pytest.mark.parametrize("blocks", SIZES)
+def test_parse_throughput(benchmark, parser: AnswerKeyParser, blocks: int) -> None:
+    text = synthetic_gabarito(blocks)
+    benchmark.extra_info["chars"] = len(text)
+    keys = benchmark(parser.parse, text)
+    assert keys
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from src.scrapers import PciConcursosScraper
+from src.scrapers.html_backends import BACKENDS
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+PAGES = sorted(FIXTURES.glob("*.html"), key=lambda path: path.name)
+
+
+def _scraper(name: str) -> PciConcursosScraper:
+    try:
+        return PciConcursosScraper(html_backend=name)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+
+@pytest.fixture(scope="module")
+def reference() -> PciConcursosScraper:
+    return PciConcursosScraper(html_backend="bs4")
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backend_matches_reference(reference: PciConcursosScraper, backend: str, page: Path) -> None:
+    scraper = _scraper(backend)
+    html = page.read_text(encoding="utf-8")
+    assert scraper.parse_exam_list(html) == reference.parse_exam_list(html)
+    assert scraper.parse_download_page(html) == reference.parse_download_page(html)
+
+
+def test_reference_listing(reference: PciConcursosScraper) -> None:
+    exams = reference.parse_exam_list((FIXTURES / "listing_provas.html").read_text(encoding="utf-8"))
+    assert len(exams) == 7
+    assert exams[0].name == "Agente de Polícia"
+    assert exams[0].page_url.endswith("/agente-de-policia-pc-df-2024-cebraspe")
+    assert exams[3].organization == "TRT 2ª Região & SP"
+
+
+def test_reference_download_page(reference: PciConcursosScraper) -> None:
+    exam_url, answer_key_url = reference.parse_download_page(
+        (FIXTURES / "download_prova.html").read_text(encoding="utf-8")
+    )
+    assert exam_url.endswith("/prova.pdf")
+    assert answer_key_url.endswith("/gabarito_definitivo.pdf")